@@ -1,13 +1,33 @@
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Form, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import pdfplumber
-import io
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+from starlette.concurrency import run_in_threadpool
+import os
+import time
+from typing import Optional
 
-from src.plagiarism_checker import analyze_plagiarism
+from src.document import Document
+from src.instrumentation import REQUEST_SECONDS, SamplingProfiler, finish_request, server_timing, start_request
+from src.pdf_extraction import extract_pdf_text
+from src.full_analysis import run_full_analysis, shutdown_pools
+from src.plagiarism_checker import analyze_plagiarism, provider_health, save_fingerprint_index
+from src.serving import PRELOAD_SHARED_STATE, check_worker_recycle, preload_shared_state
 
 app = FastAPI(title="Paper Similarity API")
 
+# Per-request sampling profiles (send `X-Profile: 1`) are only honoured when enabled here
+ENABLE_PROFILING = os.environ.get("ENABLE_PROFILING", "") == "1"
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+
+# Bigger uploads are rejected up front (page/char caps live in src/pdf_extraction.py)
+MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+
+# Under gunicorn (gunicorn.conf.py) this runs once in the master, before workers fork
+if PRELOAD_SHARED_STATE:
+	preload_shared_state()
+
 app.add_middleware(
 	CORSMiddleware,
 	allow_origins=["*"],
@@ -17,36 +37,125 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+	"""Reject oversized uploads from Content-Length before the body is read."""
+	length = request.headers.get("content-length")
+	if length and length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+		return JSONResponse(status_code=413, content={"error": f"Upload exceeds {MAX_UPLOAD_BYTES} bytes"})
+	return await call_next(request)
+
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+	"""Collect stage spans for the request and report them as a Server-Timing header."""
+	token = start_request()
+	profiler = SamplingProfiler().start() if ENABLE_PROFILING and request.headers.get("x-profile") == "1" else None
+	start = time.perf_counter()
+	status = 500
+	try:
+		response = await call_next(request)
+		status = response.status_code
+	finally:
+		elapsed = time.perf_counter() - start
+		spans = finish_request(token)
+		# Label by route template, never the raw URL, so probes cannot create new series
+		route = request.scope.get("route")
+		path = getattr(route, "path", "unmatched")
+		if path != "/metrics":
+			REQUEST_SECONDS.labels(path=path, status=str(status)).observe(elapsed)
+		check_worker_recycle()
+	response.headers["Server-Timing"] = server_timing(spans, elapsed * 1000.0)
+	response.headers["Timing-Allow-Origin"] = "*"
+	if profiler is not None:
+		profiler.stop()
+		os.makedirs(PROFILE_DIR, exist_ok=True)
+		path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{request.url.path.replace('/', '_')}.folded")
+		with open(path, "w", encoding="utf-8") as f:
+			f.write(profiler.folded())
+		response.headers["X-Profile-File"] = path
+	return response
+
+
 def extract_pdf_text_from_bytes(data: bytes) -> str:
-	text = ""
-	with pdfplumber.open(io.BytesIO(data)) as pdf:
-		for page in pdf.pages:
-			page_text = page.extract_text() or ""
-			if len(page_text.strip()) < 80:
-				try:
-					words = page.extract_words()
-					if words:
-						page_text = " ".join(w.get("text", "") for w in words)
-				except Exception:
-					pass
-			if page_text:
-				text += page_text + "\n"
-	return text
+	return extract_pdf_text(data)[0]
+
+
+def _upload_too_large(file: UploadFile) -> Optional[JSONResponse]:
+	size = file.size
+	if size is None:
+		file.file.seek(0, os.SEEK_END)
+		size = file.file.tell()
+	file.file.seek(0)
+	if size > MAX_UPLOAD_BYTES:
+		return JSONResponse(status_code=413, content={"error": f"Upload exceeds {MAX_UPLOAD_BYTES} bytes"})
+	return None
+
+
+def _lineage_id(submission_id: Optional[str], header_id: Optional[str]) -> Optional[str]:
+	"""Index id for a submission that clients track across revisions (form field, else `X-Submission-Id`)."""
+	submission_id = (submission_id or header_id or "").strip()
+	return f"submission:{submission_id}" if submission_id else None
 
 
 @app.post("/analyze")
-async def analyze(file: UploadFile = File(...)):
+async def analyze(file: UploadFile = File(...), submission_id: Optional[str] = Form(None),
+				  x_submission_id: Optional[str] = Header(None)):
 	try:
-		data = await file.read()
-		full_text = extract_pdf_text_from_bytes(data)
+		too_large = _upload_too_large(file)
+		if too_large is not None:
+			return too_large
+		# The upload is already spooled to disk; hand the file straight to the extractor
+		full_text, extraction = await run_in_threadpool(extract_pdf_text, file.file)
 		if not full_text.strip():
 			return JSONResponse(status_code=400, content={"error": "No text extracted from PDF"})
-		report = analyze_plagiarism(full_text)
+		report = await run_in_threadpool(analyze_plagiarism, full_text, _lineage_id(submission_id, x_submission_id))
+		report["extraction"] = extraction
 		return report
 	except Exception as e:
 		return JSONResponse(status_code=500, content={"error": str(e)})
 
 
+@app.post("/analyze/full")
+async def analyze_full(file: UploadFile = File(...), submission_id: Optional[str] = Form(None),
+					   x_submission_id: Optional[str] = Header(None)):
+	"""Plagiarism, bias, statistics and quality in one round trip, with per-stage timings."""
+	try:
+		too_large = _upload_too_large(file)
+		if too_large is not None:
+			return too_large
+		full_text, extraction = await run_in_threadpool(extract_pdf_text, file.file)
+		doc = Document(full_text)
+		if not doc.raw.strip():
+			return JSONResponse(status_code=400, content={"error": "No text extracted from PDF"})
+		report = await run_in_threadpool(run_full_analysis, doc, None, _lineage_id(submission_id, x_submission_id))
+		report["extraction"] = extraction
+		return report
+	except Exception as e:
+		return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@app.on_event("shutdown")
+def persist_fingerprint_index():
+	save_fingerprint_index()
+	shutdown_pools()
+
+
+@app.get("/metrics")
+async def metrics():
+	if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+		# Aggregate the per-worker metric files written in multi-worker mode
+		registry = CollectorRegistry()
+		multiprocess.MultiProcessCollector(registry)
+		return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+	return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/health")
 async def health():
 	return {"status": "ok"}
+
+
+@app.get("/health/providers")
+async def health_providers():
+	return provider_health()
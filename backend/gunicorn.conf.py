@@ -0,0 +1,56 @@
+"""Multi-worker serving: `gunicorn -c gunicorn.conf.py api:app` (run from backend/).
+
+The app is imported once in the master with its shared state preloaded (see
+src/serving.py) and then forked into uvicorn workers that share it
+copy-on-write. Workers are recycled after a request count (and, inside the app,
+when their RSS passes MAX_WORKER_RSS_MB).
+"""
+import multiprocessing
+import os
+import tempfile
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.environ.get("WORKER_TIMEOUT_S", "120"))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT_S", "60"))
+preload_app = True
+max_requests = int(os.environ.get("MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", "100"))
+
+# Read by api.py at import time, i.e. in the master before the fork
+os.environ.setdefault("PRELOAD_SHARED_STATE", "1")
+# Workers write metrics to files here so /metrics aggregates all of them
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "paper-metrics"))
+os.environ.setdefault("SEARCH_CACHE_PATH", os.path.join(tempfile.gettempdir(), "paper-search-cache.sqlite3"))
+# Fingerprint-index additions from all workers go through this journal; the master
+# merges it into FINGERPRINT_INDEX_PATH on exit (see on_exit). Without an index file
+# additions only live for this server run, so the journal starts empty.
+if "FINGERPRINT_JOURNAL_PATH" not in os.environ:
+	if os.environ.get("FINGERPRINT_INDEX_PATH"):
+		os.environ["FINGERPRINT_JOURNAL_PATH"] = os.environ["FINGERPRINT_INDEX_PATH"] + ".journal.sqlite3"
+	else:
+		os.environ["FINGERPRINT_JOURNAL_PATH"] = os.path.join(tempfile.gettempdir(), "paper-fingerprints.sqlite3")
+		for suffix in ("", "-wal", "-shm"):
+			if os.path.exists(os.environ["FINGERPRINT_JOURNAL_PATH"] + suffix):
+				os.remove(os.environ["FINGERPRINT_JOURNAL_PATH"] + suffix)
+
+
+def on_starting(server):
+	metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+	os.makedirs(metrics_dir, exist_ok=True)
+	for name in os.listdir(metrics_dir):
+		if name.endswith(".db"):
+			os.remove(os.path.join(metrics_dir, name))
+
+
+def child_exit(server, worker):
+	from prometheus_client import multiprocess
+
+	multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+	from src.plagiarism_checker import merge_fingerprint_journal
+
+	merge_fingerprint_journal()
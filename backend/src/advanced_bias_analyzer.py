@@ -2,6 +2,8 @@ import re
 import pandas as pd
 import numpy as np
 
+from src.document import Document
+
 class AdvancedBiasAnalyzer:
 
     def __init__(self):
@@ -33,24 +35,38 @@ class AdvancedBiasAnalyzer:
                 r"outstanding", r"exceptional", r"breakthrough", r"novel approach"
             ]
         }
+        # One alternation per bias type, matched against the document's lowercased view
+        self._compiled = {
+            bias_type: re.compile("|".join(f"(?:{p})" for p in patterns))
+            for bias_type, patterns in self.bias_patterns.items()
+        }
 
     def linguistic_pattern_detector(self, text):
-        """Detects bias based on a dictionary of linguistic patterns."""
-        detected_biases = []
-        for bias_type, patterns in self.bias_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    detected_biases.append(bias_type)
-                    break # Move to the next bias type once a pattern is found
+        """Detects bias based on a dictionary of linguistic patterns.
+
+        Accepts a raw string or a parsed `Document`.
+        """
+        lower = Document.ensure(text).lower
+        detected_biases = [
+            bias_type for bias_type, pattern in self._compiled.items() if pattern.search(lower)
+        ]
         return list(set(detected_biases)) # Return unique bias types found
 
 class StatisticalAnalyzer:
 
+    # This regex looks for patterns like p < 0.05, p = 0.01, p > .001
+    P_VALUE_PATTERN = re.compile(r"p\s*(?:<|=|>|\u2264|\u2265)\s*(\d*\.?\d+)")
+
+    VALIDATION_RULES = {
+        "mentions_control_group": re.compile(r"control group|controlled experiment"),
+        "mentions_randomization": re.compile(r"randomized|randomly assigned"),
+        "mentions_blinding": re.compile(r"double-blind|single-blind|blinded study")
+    }
+
     def extract_p_values(self, text):
-        """Extracts p-values from text."""
-        # This regex looks for patterns like p < 0.05, p = 0.01, p > .001
-        p_value_pattern = r"p\s*(?:<|=|>|\u2264|\u2265)\s*(\d*\.?\d+)"
-        return [float(p) for p in re.findall(p_value_pattern, text)]
+        """Extracts p-values from a raw string or parsed `Document`."""
+        # The pattern is case-sensitive, so match the raw rather than lowercased text
+        return [float(p) for p in self.P_VALUE_PATTERN.findall(Document.ensure(text).raw)]
 
     def detect_p_hacking(self, p_values):
         """Simple heuristic for detecting potential p-hacking."""
@@ -64,17 +80,8 @@ class StatisticalAnalyzer:
 
     def validate_methodology(self, text):
         """Checks for the presence of important methodology keywords."""
-        validation_rules = {
-            "mentions_control_group": [r"control group", r"controlled experiment"],
-            "mentions_randomization": [r"randomized", r"randomly assigned"],
-            "mentions_blinding": [r"double-blind", r"single-blind", r"blinded study"]
-        }
-        
-        methodology_checks = {}
-        for check, patterns in validation_rules.items():
-            methodology_checks[check] = any(re.search(p, text, re.IGNORECASE) for p in patterns)
-        
-        return methodology_checks
+        lower = Document.ensure(text).lower
+        return {check: bool(pattern.search(lower)) for check, pattern in self.VALIDATION_RULES.items()}
 
 if __name__ == '__main__':
     analyzer = AdvancedBiasAnalyzer()
@@ -1,8 +1,14 @@
+import copy
 import torch
 import pandas as pd
 from transformers import DistilBertTokenizer, DistilBertForSequenceClassification, Trainer, TrainingArguments
 from torch.utils.data import Dataset
 
+from src.model_store import get_model_store
+
+BASE_MODEL = 'distilbert-base-uncased'
+BIAS_MODEL_NAME = 'bias_detector'
+
 class BiasDataset(Dataset):
     def __init__(self, texts, labels, tokenizer):
         self.encodings = tokenizer(texts, truncation=True, padding=True)
@@ -17,13 +23,42 @@ class BiasDataset(Dataset):
         return len(self.labels)
 
 class BiasDetector:
-    def __init__(self, num_labels=5):
-        self.model = DistilBertForSequenceClassification.from_pretrained(
-            'distilbert-base-uncased', 
-            num_labels=num_labels
-        )
-        self.tokenizer = DistilBertTokenizer.from_pretrained('distilbert-base-uncased')
-        
+    def __init__(self, num_labels=5, labels=None, store=None, base_version=None):
+        """A detector to fine-tune: the base checkpoint, or a private copy of a stored version.
+
+        Continuing from `base_version` requires the stored labels to match `labels`;
+        use `BiasDetector.load` for inference with the shared stored model.
+        """
+        self.store = store or get_model_store()
+        self.labels = labels
+        if base_version is None:
+            self.model = DistilBertForSequenceClassification.from_pretrained(BASE_MODEL, num_labels=num_labels)
+            self.tokenizer = DistilBertTokenizer.from_pretrained(BASE_MODEL)
+            return
+        stored_labels = self.store.manifest(BIAS_MODEL_NAME, base_version)['metadata'].get('labels')
+        if labels is not None and stored_labels != list(labels):
+            raise ValueError(
+                f"{BIAS_MODEL_NAME} version {base_version} was trained on labels {stored_labels}, not {list(labels)}"
+            )
+        model, self.tokenizer = self.store.load(BIAS_MODEL_NAME, base_version)
+        # Never train the instance shared with every inference caller in this process
+        self.model = copy.deepcopy(model)
+        self.model.train()
+        self.labels = stored_labels
+
+    @classmethod
+    def load(cls, store=None, version=None):
+        """Inference detector on a stored version (latest by default).
+
+        The model is loaded once per process (memory-mapped safetensors) and
+        shared by every detector returned here, so it must not be trained.
+        """
+        detector = cls.__new__(cls)
+        detector.store = store or get_model_store()
+        detector.model, detector.tokenizer = detector.store.load(BIAS_MODEL_NAME, version)
+        detector.labels = detector.store.manifest(BIAS_MODEL_NAME, version)['metadata'].get('labels')
+        return detector
+
     def train_bias_detector(self, train_dataset, val_dataset):
         training_args = TrainingArguments(
             output_dir='./results/bias_model',
@@ -46,6 +81,19 @@ class BiasDetector:
         
         trainer.train()
 
+    def save(self, metadata=None):
+        """Save the fine-tuned weights (safetensors) and tokenizer as a new store version."""
+        return self.store.save_transformer(
+            BIAS_MODEL_NAME, self.model, self.tokenizer, {'base_model': BASE_MODEL, 'labels': self.labels, **(metadata or {})}
+        )
+
+    def predict(self, sentence):
+        """Label of the most likely class for one sentence."""
+        inputs = self.tokenizer(sentence, truncation=True, return_tensors='pt')
+        with torch.no_grad():
+            label_id = int(self.model(**inputs).logits.argmax(dim=-1)[0])
+        return self.labels[label_id] if self.labels else label_id
+
 if __name__ == '__main__':
     # This is a placeholder for running the training.
     # It requires a larger, well-formed dataset to work correctly.
@@ -71,7 +119,7 @@ if __name__ == '__main__':
     val_texts = train_texts # Using same for demo
     val_labels = train_labels # Using same for demo
 
-    detector = BiasDetector(num_labels=len(labels))
+    detector = BiasDetector(num_labels=len(labels), labels=labels)  # always starts from the base checkpoint
     
     train_dataset = BiasDataset(train_texts, train_labels, detector.tokenizer)
     val_dataset = BiasDataset(val_texts, val_labels, detector.tokenizer)
@@ -80,4 +128,4 @@ if __name__ == '__main__':
     # To run training, you would call:
     # print("Starting training...")
     # detector.train_bias_detector(train_dataset, val_dataset)
-    # print("Training complete.")
+    # print(f"Training complete. Saved version {detector.save()}.")
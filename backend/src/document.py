@@ -0,0 +1,183 @@
+import re
+from typing import Callable, Dict, List, NamedTuple, Tuple, Union
+
+# Canonical section name -> heading variants (matched against a whole, lowercased line)
+HEADING_PATTERNS: List[Tuple[str, str]] = [
+	("Abstract", r"abstract"),
+	("Introduction", r"introduction"),
+	("Related Work", r"related work|background|literature review|prior work"),
+	("Methodology", r"methodology|methods|materials and methods|experimental setup|approach"),
+	("Results", r"results|results and discussion|experiments|experimental results|evaluation|findings"),
+	("Discussion", r"discussion"),
+	("Conclusions", r"conclusion|conclusions|discussion and conclusion|discussion and conclusions|summary"),
+	("Acknowledgements", r"acknowledgements?|acknowledgments?"),
+	("References", r"references|bibliography|works cited"),
+	("Appendix", r"appendix|appendices|supplementary material"),
+]
+
+# Optional numbering ("2", "2.1.", "IV.") then the heading, optionally followed by a colon
+_HEADING_RES = [
+	(name, re.compile(rf"^(?:(?:\d+(?:\.\d+)*|[ivx]+)\.?\s*)?(?:{pattern})\s*:?$"))
+	for name, pattern in HEADING_PATTERNS
+]
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(\[])")
+
+
+def normalize_whitespace(text: str) -> str:
+	"""Collapse multiple spaces/newlines and strip."""
+	if not text:
+		return ""
+	text = re.sub(r"[ \t]+", " ", text)
+	text = re.sub(r"\s+", " ", text)
+	return text.strip()
+
+
+class Heading(NamedTuple):
+	name: str   # canonical section name, e.g. "Methodology"
+	line: int   # line number in the raw text
+	start: int  # char offset where the heading line starts
+	end: int    # char offset just past the heading line
+
+
+class Document:
+	"""A paper parsed once and shared by every analyzer.
+
+	Views (lowercased text, line and sentence offsets, the heading map and the
+	section texts) are computed lazily on first access and cached, so a full
+	analysis normalizes the text once instead of once per analyzer.
+	"""
+
+	def __init__(self, text: str):
+		self.raw = text or ""
+		self._views: Dict[str, object] = {}
+
+	@classmethod
+	def ensure(cls, text: Union["Document", str]) -> "Document":
+		"""Return `text` unchanged if it is already a Document, otherwise parse it."""
+		return text if isinstance(text, Document) else cls(text)
+
+	def view(self, name: str, factory: Callable[["Document"], object]) -> object:
+		"""Memoize an analyzer-specific derived view of this document."""
+		if name not in self._views:
+			self._views[name] = factory(self)
+		return self._views[name]
+
+	@property
+	def lower(self) -> str:
+		return self.view("lower", lambda d: d.raw.lower())
+
+	@property
+	def normalized(self) -> str:
+		return self.view("normalized", lambda d: normalize_whitespace(d.raw))
+
+	@property
+	def line_spans(self) -> List[Tuple[int, int]]:
+		"""(start, end) char offsets of every line, newline excluded."""
+		return self.view("line_spans", _line_spans)
+
+	@property
+	def lines(self) -> List[str]:
+		"""Stripped lines."""
+		return self.view("lines", lambda d: [d.raw[s:e].strip() for s, e in d.line_spans])
+
+	@property
+	def sentence_spans(self) -> List[Tuple[int, int]]:
+		"""(start, end) char offsets of sentences, split on terminal punctuation."""
+		return self.view("sentence_spans", _sentence_spans)
+
+	@property
+	def sentences(self) -> List[str]:
+		return [normalize_whitespace(self.raw[s:e]) for s, e in self.sentence_spans]
+
+	@property
+	def headings(self) -> List[Heading]:
+		"""Every recognised section heading, in document order."""
+		return self.view("headings", _find_headings)
+
+	@property
+	def heading_map(self) -> Dict[str, Heading]:
+		"""Canonical section name -> its first heading."""
+		def build(d: "Document") -> Dict[str, Heading]:
+			out: Dict[str, Heading] = {}
+			for h in d.headings:
+				out.setdefault(h.name, h)
+			return out
+		return self.view("heading_map", build)
+
+	@property
+	def title(self) -> str:
+		return next((l for l in self.lines if l and len(l) <= 200), "Untitled")
+
+	def section(self, name: str) -> str:
+		"""Normalized body of a section: from its heading to the next heading of any kind."""
+		key = f"section:{name}"
+		if key not in self._views:
+			heading = self.heading_map.get(name)
+			text = ""
+			if heading is not None:
+				following = [h.start for h in self.headings if h.start > heading.start]
+				end = min(following) if following else len(self.raw)
+				text = normalize_whitespace(self.raw[heading.end:end])
+			self._views[key] = text
+		return str(self._views[key])
+
+	@property
+	def sections(self) -> Dict[str, str]:
+		"""Title, Abstract, Methodology and Conclusions with positional fallbacks."""
+		return dict(self.view("sections", _legacy_sections))
+
+
+def _line_spans(doc: Document) -> List[Tuple[int, int]]:
+	spans: List[Tuple[int, int]] = []
+	pos = 0
+	for line in doc.raw.splitlines(keepends=True):
+		body = line.rstrip("\r\n")
+		spans.append((pos, pos + len(body)))
+		pos += len(line)
+	return spans
+
+
+def _sentence_spans(doc: Document) -> List[Tuple[int, int]]:
+	text = doc.raw
+	spans: List[Tuple[int, int]] = []
+	start = 0
+	for m in _SENTENCE_BOUNDARY.finditer(text):
+		if text[start:m.start()].strip():
+			spans.append((start, m.start()))
+		start = m.end()
+	if text[start:].strip():
+		spans.append((start, len(text.rstrip())))
+	return spans
+
+
+def _find_headings(doc: Document) -> List[Heading]:
+	headings: List[Heading] = []
+	lower = doc.lower
+	# The first line is treated as the title, never as a heading
+	for i, (start, end) in enumerate(doc.line_spans[1:], start=1):
+		line = lower[start:end].strip()
+		if not line or len(line) > 60:
+			continue
+		for name, rx in _HEADING_RES:
+			if rx.match(line):
+				headings.append(Heading(name, i, start, end))
+				break
+	return headings
+
+
+def _legacy_sections(doc: Document) -> Dict[str, str]:
+	lines = doc.lines
+	sections: Dict[str, str] = {
+		"Title": doc.title,
+		"Abstract": doc.section("Abstract"),
+		"Methodology": doc.section("Methodology"),
+		"Conclusions": doc.section("Conclusions"),
+	}
+	# Fallbacks: if markers not found, approximate by paragraphs
+	if not sections["Abstract"]:
+		sections["Abstract"] = normalize_whitespace(" ".join(lines[:200]))[:1500]
+	if not sections["Methodology"]:
+		sections["Methodology"] = normalize_whitespace(" ".join(lines[200:800]))[:3000]
+	if not sections["Conclusions"]:
+		sections["Conclusions"] = normalize_whitespace(" ".join(lines[-400:]))[:2000]
+	return sections
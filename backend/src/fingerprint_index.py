@@ -0,0 +1,406 @@
+import os
+import re
+import zlib
+import struct
+import zipfile
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.shared_cache import SqliteStore
+
+# A k-gram is K consecutive normalized words; winnowing keeps the minimum hash of
+# every window of W consecutive k-grams. Any shared run of at least K + W - 1
+# words is guaranteed to produce at least one common fingerprint.
+DEFAULT_K = 5
+DEFAULT_W = 4
+# Fingerprints found in more documents than this are boilerplate ("the rest of
+# this paper is organized as follows", common reference strings): like MOSS,
+# they are ignored by queries and stop collecting postings.
+DEFAULT_MAX_DF = 50
+
+_WORD_RE = re.compile(r"[a-z0-9]+", re.IGNORECASE)
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+def _tokenize(text: str) -> List[Tuple[str, int, int]]:
+	"""Lowercased alphanumeric words with their (start, end) char offsets in `text`."""
+	return [(m.group(0).lower(), m.start(), m.end()) for m in _WORD_RE.finditer(text or "")]
+
+
+def kgram_hashes(tokens: List[Tuple[str, int, int]], k: int = DEFAULT_K) -> List[int]:
+	"""Rolling polynomial hash of every k-word window (deterministic across processes)."""
+	if len(tokens) < k:
+		return []
+	word_hashes = [zlib.crc32(w.encode("utf-8")) for w, _, _ in tokens]
+	top = pow(_BASE, k - 1, _MOD)
+	h = 0
+	for wh in word_hashes[:k]:
+		h = (h * _BASE + wh) % _MOD
+	out = [h]
+	for i in range(k, len(word_hashes)):
+		h = ((h - word_hashes[i - k] * top) * _BASE + word_hashes[i]) % _MOD
+		out.append(h)
+	return out
+
+
+def winnow(hashes: List[int], w: int = DEFAULT_W) -> List[Tuple[int, int]]:
+	"""Robust winnowing: (hash, k-gram position) picked as the rightmost minimum per window.
+
+	Uses a monotonic deque so the whole pass is linear in the number of k-grams.
+	"""
+	if not hashes:
+		return []
+	if len(hashes) <= w:
+		pos = min(range(len(hashes)), key=lambda i: (hashes[i], -i))
+		return [(hashes[pos], pos)]
+	selected: List[Tuple[int, int]] = []
+	window: deque = deque()
+	last = -1
+	for i, h in enumerate(hashes):
+		while window and hashes[window[-1]] >= h:
+			window.pop()
+		window.append(i)
+		if window[0] <= i - w:
+			window.popleft()
+		if i >= w - 1 and window[0] != last:
+			last = window[0]
+			selected.append((hashes[last], last))
+	return selected
+
+
+def fingerprint(text: str, k: int = DEFAULT_K, w: int = DEFAULT_W) -> List[Tuple[int, int, int]]:
+	"""Fingerprints of `text` as (hash, char_start, char_end) of the selected k-grams."""
+	tokens = _tokenize(text)
+	return [
+		(h, tokens[pos][1], tokens[pos + k - 1][2])
+		for h, pos in winnow(kgram_hashes(tokens, k), w)
+	]
+
+
+def _mmap_npz(path: str) -> Dict[str, np.ndarray]:
+	"""Memory-map every array of an uncompressed `.npz` (as written by `np.savez`).
+
+	`np.load` ignores `mmap_mode` for archives, so each member's `.npy` header is
+	parsed in place and its data mapped straight from the zip file.
+	"""
+	arrays: Dict[str, np.ndarray] = {}
+	with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+		for info in zf.infolist():
+			if info.compress_type != zipfile.ZIP_STORED:
+				raise ValueError(f"{path}: '{info.filename}' is compressed and cannot be memory-mapped")
+			f.seek(info.header_offset + 26)  # name and extra-field lengths of the local file header
+			name_len, extra_len = struct.unpack("<HH", f.read(4))
+			f.seek(info.header_offset + 30 + name_len + extra_len)
+			version = np.lib.format.read_magic(f)
+			if version == (1, 0):
+				shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+			else:
+				shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+			name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+			if int(np.prod(shape)) == 0:
+				arrays[name] = np.zeros(shape, dtype=dtype)
+			else:
+				arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order="F" if fortran else "C")
+	return arrays
+
+
+class FingerprintIndex:
+	"""Hash -> (doc, offset) postings of winnowed k-gram fingerprints.
+
+	The base index loaded from disk is a pair of flat uint64 arrays (hashes
+	sorted, postings packed as `doc_idx << 32 | char_offset`) plus sorted
+	document-frequency arrays, all memory-mapped and looked up with
+	`np.searchsorted`: no per-posting Python objects, so forked workers keep
+	sharing the pages. Documents added while serving go into a small dict that
+	`save` merges back into the arrays. Hashes shared by more than `max_df`
+	documents are skipped, keeping query cost and false "copies" from growing
+	with the corpus. Re-adding a doc id with `replace=True` (a revised
+	submission) retires the earlier version's postings instead of keeping both.
+	"""
+
+	def __init__(self, k: int = DEFAULT_K, w: int = DEFAULT_W, max_df: int = DEFAULT_MAX_DF):
+		self.k = k
+		self.w = w
+		self.max_df = max_df
+		self.doc_ids: List[str] = []
+		self._doc_pos: Dict[str, int] = {}
+		self._base_hashes = np.zeros(0, dtype=np.uint64)
+		self._base_postings = np.zeros(0, dtype=np.uint64)
+		self._base_df_hashes = np.zeros(0, dtype=np.uint64)
+		self._base_df = np.zeros(0, dtype=np.uint32)
+		self._n_base_docs = 0
+		# Documents added (and df changes) since the base arrays were built
+		self._table: Dict[int, List[int]] = {}
+		self._df: Dict[int, int] = {}
+		# Doc slots retired by a replacement; `save` drops them
+		self._removed: Set[int] = set()
+		# Last FingerprintJournal entry applied to this index (not persisted)
+		self.journal_seq = 0
+		self._lock = threading.Lock()
+
+	def __len__(self) -> int:
+		return len(self.doc_ids) - len(self._removed)
+
+	def __contains__(self, doc_id: str) -> bool:
+		return doc_id in self._doc_pos
+
+	@property
+	def n_postings(self) -> int:
+		return len(self._base_postings) + sum(len(posts) for posts in self._table.values())
+
+	def add_document(self, doc_id: str, text: str, replace: bool = False) -> int:
+		"""Insert a document's fingerprints; returns how many were added (0 if already indexed).
+
+		With `replace`, an already indexed `doc_id` is swapped for the new text.
+		"""
+		return self.add_fingerprints(doc_id, fingerprint(text, self.k, self.w), replace)
+
+	def add_fingerprints(self, doc_id: str, prints: Sequence[Tuple[int, int, int]], replace: bool = False) -> int:
+		"""Insert precomputed (hash, start, end) fingerprints, e.g. replayed from a journal."""
+		with self._lock:
+			if doc_id in self._doc_pos:
+				if not replace:
+					return 0
+				self._remove(self._doc_pos[doc_id])
+			idx = len(self.doc_ids)
+			self.doc_ids.append(doc_id)
+			self._doc_pos[doc_id] = idx
+			distinct = list({h for h, _, _ in prints})
+			base_df = dict(zip(distinct, self._base_frequencies(distinct)))
+			for h in distinct:
+				self._df[h] = self._df.get(h, 0) + 1
+			for h, start, _ in prints:
+				if base_df[h] + self._df[h] <= self.max_df:
+					self._table.setdefault(h, []).append((idx << 32) | start)
+		return len(prints)
+
+	def _remove(self, idx: int) -> None:
+		"""Retire doc slot `idx`: drop its added postings and its document frequencies.
+
+		Hashes that were already past `max_df` when the document was added kept no
+		posting for it, so their counts stay one high; they remain ignored either way.
+		"""
+		hashes: Set[int] = set()
+		if idx < self._n_base_docs:
+			own = (self._base_postings >> np.uint64(32)) == np.uint64(idx)
+			hashes.update(np.unique(self._base_hashes[own]).tolist())
+		for h, posts in list(self._table.items()):
+			kept = [p for p in posts if p >> 32 != idx]
+			if len(kept) < len(posts):
+				hashes.add(h)
+				if kept:
+					self._table[h] = kept
+				else:
+					del self._table[h]
+		for h in hashes:
+			self._df[h] = self._df.get(h, 0) - 1
+		self._removed.add(idx)
+
+	def _base_frequencies(self, hashes: Sequence[int]) -> List[int]:
+		"""Base-index document frequency of each hash (0 where absent)."""
+		if not len(self._base_df_hashes) or not hashes:
+			return [0] * len(hashes)
+		keys = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+		pos = np.minimum(np.searchsorted(self._base_df_hashes, keys), len(self._base_df_hashes) - 1)
+		return np.where(self._base_df_hashes[pos] == keys, self._base_df[pos], 0).tolist()
+
+	def document_frequency(self, h: int) -> int:
+		"""Number of indexed documents containing fingerprint `h`."""
+		return self._base_frequencies([h])[0] + self._df.get(h, 0)
+
+	def is_frequent(self, h: int) -> bool:
+		return self.document_frequency(h) > self.max_df
+
+	def query(self, text: str, exclude: Optional[str] = None, min_words: Optional[int] = None) -> List[Dict[str, object]]:
+		"""Find passages of `text` that share fingerprints with indexed documents.
+
+		Adjacent fingerprint hits against the same source are merged into one
+		passage. Returns passages sorted by length (longest first), each with
+		char offsets into the query (`start`/`end`) and the source (`source_start`/`source_end`).
+		"""
+		min_words = self.k if min_words is None else min_words
+		excluded = self._doc_pos.get(exclude) if exclude else None
+		hits: Dict[int, List[Tuple[int, int, int]]] = {}
+		prints = fingerprint(text, self.k, self.w)
+		hashes = [h for h, _, _ in prints]
+		keys = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+		lows = np.searchsorted(self._base_hashes, keys, "left").tolist()
+		highs = np.searchsorted(self._base_hashes, keys, "right").tolist()
+		for (h, start, end), base_df, lo, hi in zip(prints, self._base_frequencies(hashes), lows, highs):
+			if base_df + self._df.get(h, 0) > self.max_df:
+				continue
+			postings = self._base_postings[lo:hi].tolist() if hi > lo else []
+			for packed in postings + self._table.get(h, []):
+				doc_idx = packed >> 32
+				if doc_idx == excluded or doc_idx in self._removed:
+					continue
+				hits.setdefault(doc_idx, []).append((start, end, packed & 0xFFFFFFFF))
+
+		# Within a copied run consecutive winnowed k-grams are at most W < K words
+		# apart, so their spans overlap; allow a little slack for punctuation.
+		slack = 16
+		passages: List[Dict[str, object]] = []
+		for doc_idx, doc_hits in hits.items():
+			doc_hits.sort()
+			cur: Optional[List[int]] = None
+			for start, end, src in doc_hits:
+				if cur is not None and start <= cur[1] + slack and cur[2] <= src <= cur[3] + slack:
+					cur[1] = max(cur[1], end)
+					cur[3] = max(cur[3], src + (end - start))
+					continue
+				if cur is not None:
+					passages.append(self._passage(text, doc_idx, cur))
+				cur = [start, end, src, src + (end - start)]
+			if cur is not None:
+				passages.append(self._passage(text, doc_idx, cur))
+		passages = [p for p in passages if len(_WORD_RE.findall(str(p["text"]))) >= min_words]
+		passages.sort(key=lambda p: int(p["end"]) - int(p["start"]), reverse=True)
+		return passages
+
+	def _passage(self, text: str, doc_idx: int, span: List[int]) -> Dict[str, object]:
+		start, end, src_start, src_end = span
+		return {
+			"source": self.doc_ids[doc_idx],
+			"start": start,
+			"end": end,
+			"source_start": src_start,
+			"source_end": src_end,
+			"text": text[start:end],
+		}
+
+	def save(self, path: str) -> None:
+		"""Persist as flat arrays: sorted hashes, packed postings, document frequencies and doc ids.
+
+		Written uncompressed so `load` can memory-map every array.
+		"""
+		with self._lock:
+			added = sorted(self._table.items())
+			hashes = np.concatenate([
+				self._base_hashes,
+				np.fromiter((h for h, posts in added for _ in posts), dtype=np.uint64),
+			])
+			postings = np.concatenate([
+				self._base_postings,
+				np.fromiter((p for _, posts in added for p in posts), dtype=np.uint64),
+			])
+			# Renumber documents past the retired slots
+			live = np.ones(len(self.doc_ids), dtype=bool)
+			live[list(self._removed)] = False
+			renumber = (np.cumsum(live) - 1).astype(np.uint64)
+			doc_idx = (postings >> np.uint64(32)).astype(np.int64)
+			kept = live[doc_idx]
+			hashes = hashes[kept]
+			postings = (renumber[doc_idx[kept]] << np.uint64(32)) | (postings[kept] & np.uint64(0xFFFFFFFF))
+			order = np.argsort(hashes, kind="stable")
+			df_hashes, inverse = np.unique(np.concatenate([
+				self._base_df_hashes, np.fromiter(self._df.keys(), dtype=np.uint64, count=len(self._df)),
+			]), return_inverse=True)
+			df_counts = np.concatenate([
+				self._base_df.astype(np.int64), np.fromiter(self._df.values(), dtype=np.int64, count=len(self._df)),
+			])
+			df = np.bincount(inverse, weights=df_counts, minlength=len(df_hashes)).astype(np.int64)
+			df_hashes, df = df_hashes[df > 0], df[df > 0].astype(np.uint32)
+			doc_ids = np.array([d for d, keep in zip(self.doc_ids, live) if keep], dtype=str)
+		tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # concurrent savers never share a temp file
+		with open(tmp, "wb") as f:
+			np.savez(
+				f, hashes=hashes[order], postings=postings[order], doc_ids=doc_ids, df_hashes=df_hashes, df=df,
+				params=np.array([self.k, self.w, self.max_df]),
+			)
+		os.replace(tmp, path)  # readers that mapped the old file keep its pages
+
+	@classmethod
+	def load(cls, path: str) -> "FingerprintIndex":
+		data = _mmap_npz(path)
+		index = cls(*[int(v) for v in data["params"]])
+		index.doc_ids = [str(d) for d in data["doc_ids"]]
+		index._doc_pos = {d: i for i, d in enumerate(index.doc_ids)}
+		index._n_base_docs = len(index.doc_ids)
+		index._base_hashes = data["hashes"]
+		index._base_postings = data["postings"]
+		index._base_df_hashes = data["df_hashes"]
+		index._base_df = data["df"]
+		return index
+
+
+class FingerprintJournal(SqliteStore):
+	"""Append-only log of documents indexed by any worker process.
+
+	With several workers each holds its own in-memory index; every addition is
+	appended here and `sync` applies new entries to a worker's index, so all
+	workers (including freshly forked ones) see every submission. A replaced
+	document is re-appended under a new seq, and `sync` swaps it in wherever the
+	old version was applied. `merge_into_file` folds the log into the `.npz`
+	index and drops the merged entries.
+	"""
+
+	schema = "CREATE TABLE IF NOT EXISTS fingerprints (seq INTEGER PRIMARY KEY AUTOINCREMENT, doc_id TEXT UNIQUE, prints BLOB)"
+
+	def __init__(self, path: str):
+		super().__init__(path)
+		self._sync_lock = threading.Lock()
+
+	def append(self, doc_id: str, prints: Sequence[Tuple[int, int, int]], replace: bool = False) -> None:
+		blob = np.array(prints, dtype=np.uint64).reshape(-1, 3).tobytes()
+		verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+		self._conn().execute(f"{verb} INTO fingerprints (doc_id, prints) VALUES (?, ?)", (doc_id, blob))
+
+	def sync(self, index: FingerprintIndex) -> int:
+		"""Apply entries newer than `index.journal_seq`; returns how many documents were added or replaced."""
+		with self._sync_lock:
+			rows = self._conn().execute(
+				"SELECT seq, doc_id, prints FROM fingerprints WHERE seq > ? ORDER BY seq", (index.journal_seq,)
+			).fetchall()
+			added = 0
+			for seq, doc_id, blob in rows:
+				prints = np.frombuffer(blob, dtype=np.uint64).reshape(-1, 3).tolist()
+				# A doc id seen again under a newer seq can only be a replacement
+				added += index.add_fingerprints(doc_id, [tuple(p) for p in prints], replace=True) > 0
+				index.journal_seq = max(index.journal_seq, seq)
+		return added
+
+	def merge_into_file(self, index: FingerprintIndex, path: str) -> None:
+		"""Save `index` with every journaled document to `path`, then drop the merged entries."""
+		self.sync(index)
+		index.save(path)
+		self._conn().execute("DELETE FROM fingerprints WHERE seq <= ?", (index.journal_seq,))
+
+
+def build_index(documents: Iterable[Tuple[str, str]], k: int = DEFAULT_K, w: int = DEFAULT_W,
+				max_df: int = DEFAULT_MAX_DF) -> FingerprintIndex:
+	"""Build an index from (doc_id, text) pairs."""
+	index = FingerprintIndex(k=k, w=w, max_df=max_df)
+	for doc_id, text in documents:
+		index.add_document(doc_id, text)
+	return index
+
+
+def iter_corpus_dir(corpus_dir: str) -> Iterable[Tuple[str, str]]:
+	"""(relative path, text) for every .txt file under `corpus_dir`."""
+	for root, _, files in os.walk(corpus_dir):
+		for name in sorted(files):
+			if not name.lower().endswith(".txt"):
+				continue
+			path = os.path.join(root, name)
+			with open(path, "r", encoding="utf-8", errors="ignore") as f:
+				yield os.path.relpath(path, corpus_dir), f.read()
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="Build a winnowing fingerprint index from a directory of .txt files.")
+	parser.add_argument("corpus_dir")
+	parser.add_argument("output", help="Path of the .npz index to write")
+	parser.add_argument("-k", type=int, default=DEFAULT_K, help="Words per k-gram")
+	parser.add_argument("-w", type=int, default=DEFAULT_W, help="Winnowing window size")
+	parser.add_argument("--max-df", type=int, default=DEFAULT_MAX_DF, help="Ignore fingerprints in more documents than this")
+	args = parser.parse_args()
+
+	idx = build_index(iter_corpus_dir(args.corpus_dir), k=args.k, w=args.w, max_df=args.max_df)
+	idx.save(args.output)
+	print(f"Indexed {len(idx)} documents ({idx.n_postings} fingerprints) -> {args.output}")
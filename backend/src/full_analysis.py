@@ -0,0 +1,176 @@
+import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Union
+
+from src.document import Document
+from src.plagiarism_checker import SECTION_NAMES, analyze_section_memoized, build_plagiarism_report
+from src.advanced_bias_analyzer import AdvancedBiasAnalyzer, StatisticalAnalyzer
+from src.quality_assessor import QualityAssessor
+from src.instrumentation import record_span, span, submit_with_context
+
+# Seconds each stage may run before its (partial) result is reported
+DEFAULT_STAGE_BUDGETS: Dict[str, float] = {
+	"plagiarism": float(os.environ.get("PLAGIARISM_BUDGET_S", "45")),
+	"bias": float(os.environ.get("BIAS_BUDGET_S", "5")),
+	"statistics": float(os.environ.get("STATISTICS_BUDGET_S", "5")),
+	"quality": float(os.environ.get("QUALITY_BUDGET_S", "5")),
+}
+
+# Section searches and the regex analyzers all run on threads over the one shared
+# Document: the analyzers take about a millisecond, far less than shipping the
+# raw text to another process and parsing it again there would cost. They get a
+# pool of their own, so a backlog of slow provider searches from concurrent
+# requests can never queue them past their budgets.
+POOL_SIZES: Dict[str, int] = {
+	"sections": int(os.environ.get("SECTION_POOL_SIZE", "16")),
+	"analyzers": int(os.environ.get("ANALYZER_POOL_SIZE", "4")),
+}
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(name: str) -> ThreadPoolExecutor:
+	with _pool_lock:
+		if name not in _pools:
+			_pools[name] = ThreadPoolExecutor(max_workers=POOL_SIZES[name], thread_name_prefix=name)
+		return _pools[name]
+
+
+def shutdown_pools(wait: bool = False) -> None:
+	with _pool_lock:
+		for pool in _pools.values():
+			pool.shutdown(wait=wait, cancel_futures=True)
+		_pools.clear()
+
+
+# Analyzers are created once per process and shared
+_analyzers: Dict[str, object] = {}
+
+
+def _analyzer(name: str, factory: Callable[[], object]):
+	if name not in _analyzers:
+		_analyzers[name] = factory()
+	return _analyzers[name]
+
+
+def _timed(fn: Callable[[Document], object], doc: Document):
+	start = time.perf_counter()
+	result = fn(doc)
+	return result, (time.perf_counter() - start) * 1000.0
+
+
+def bias_stage(doc: Document) -> Dict[str, object]:
+	analyzer = _analyzer("bias", AdvancedBiasAnalyzer)
+	return {"detected_biases": sorted(analyzer.linguistic_pattern_detector(doc))}
+
+
+def statistics_stage(doc: Document) -> Dict[str, object]:
+	analyzer = _analyzer("statistics", StatisticalAnalyzer)
+	p_values = analyzer.extract_p_values(doc)
+	return {
+		"p_values": p_values,
+		"p_hacking_suspected": analyzer.detect_p_hacking(p_values),
+		"methodology_checks": analyzer.validate_methodology(doc),
+	}
+
+
+def quality_stage(doc: Document) -> Dict[str, object]:
+	assessor = _analyzer("quality", QualityAssessor)
+	score, scores = assessor.calculate_unified_quality_score(doc)
+	return {
+		"score": round(float(score), 4),
+		"scores": {k: float(v) for k, v in scores.items()},
+		"confidence_interval": [float(v) for v in assessor.create_confidence_intervals(score)],
+	}
+
+
+ANALYZER_STAGES: Dict[str, Callable[[Document], Dict[str, object]]] = {
+	"bias": bias_stage,
+	"statistics": statistics_stage,
+	"quality": quality_stage,
+}
+
+
+def _timed_section(section_text: str):
+	start = time.perf_counter()
+	result, reused = analyze_section_memoized(section_text)
+	return result, (time.perf_counter() - start) * 1000.0, reused
+
+
+def run_full_analysis(full_text: Union[Document, str], budgets: Optional[Dict[str, float]] = None,
+					  doc_id: Optional[str] = None) -> Dict[str, object]:
+	"""Run plagiarism, bias, statistics and quality stages concurrently over one parse.
+
+	Every stage starts immediately and gets its own budget measured from the
+	start of the request. A stage that overruns is reported with status
+	"timeout"; the plagiarism stage returns whichever sections finished in time.
+	`doc_id` is passed to `build_plagiarism_report` (submission lineage).
+	"""
+	budgets = {**DEFAULT_STAGE_BUDGETS, **(budgets or {})}
+	doc = Document.ensure(full_text)
+	t0 = time.perf_counter()
+
+	with span("sections"):
+		sections = doc.sections
+	section_futures: Dict[str, Future] = {
+		name: submit_with_context(_get_pool("sections"), _timed_section, sections.get(name, "")) for name in SECTION_NAMES
+	}
+	analyzer_futures: Dict[str, Future] = {
+		name: submit_with_context(_get_pool("analyzers"), _timed, stage, doc) for name, stage in ANALYZER_STAGES.items()
+	}
+
+	def remaining(stage: str) -> float:
+		return max(0.0, budgets[stage] - (time.perf_counter() - t0))
+
+	stages: Dict[str, Dict[str, object]] = {}
+
+	# Plagiarism: collect whichever sections complete within the budget
+	done, _ = wait(list(section_futures.values()), timeout=remaining("plagiarism"))
+	section_results: Dict[str, Dict[str, object]] = {}
+	section_ms: Dict[str, float] = {}
+	reused: List[str] = []
+	errors: List[str] = []
+	for name, fut in section_futures.items():
+		if fut not in done:
+			fut.cancel()
+			continue
+		try:
+			section_results[name], section_ms[name], was_reused = fut.result()
+			if was_reused:
+				reused.append(name)
+		except Exception as e:
+			errors.append(f"{name}: {e}")
+	if len(done) < len(section_futures):
+		status = "timeout"
+	else:
+		status = "error" if errors else "ok"
+	elapsed = time.perf_counter() - t0
+	record_span("stage.plagiarism", elapsed)
+	stage: Dict[str, object] = {
+		"status": status,
+		"elapsed_ms": round(elapsed * 1000.0, 1),
+		"section_ms": {k: round(v, 1) for k, v in section_ms.items()},
+		"result": build_plagiarism_report(doc, section_results, doc_id, reused),
+	}
+	if errors:
+		stage["errors"] = errors
+	stages["plagiarism"] = stage
+
+	for name, fut in analyzer_futures.items():
+		try:
+			result, elapsed = fut.result(timeout=remaining(name))
+			record_span(f"stage.{name}", elapsed / 1000.0)
+			stages[name] = {"status": "ok", "elapsed_ms": round(elapsed, 1), "result": result}
+		except FutureTimeoutError:
+			fut.cancel()
+			stages[name] = {"status": "timeout", "elapsed_ms": round(budgets[name] * 1000.0, 1), "result": None}
+		except Exception as e:
+			stages[name] = {"status": "error", "elapsed_ms": round((time.perf_counter() - t0) * 1000.0, 1), "result": None, "error": str(e)}
+
+	return {
+		"stages": stages,
+		"total_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+	}
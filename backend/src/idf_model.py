@@ -0,0 +1,114 @@
+import os
+import json
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# Files written by `ReferenceIdfModel.save`
+VOCAB_FILE = "vocab.npy"
+IDF_FILE = "idf.npy"
+META_FILE = "meta.json"
+
+
+class ReferenceIdfModel:
+	"""Vocabulary and IDF weights fitted once on a reference corpus.
+
+	Scoring only tokenizes and applies the stored weights (`transform`), so
+	similarity no longer refits on every pair and scores are stable across
+	requests. Both the vocabulary (a sorted fixed-width string array, searched
+	with `np.searchsorted`) and the IDF vector are plain `.npy` arrays that are
+	memory-mapped on load, so no per-term Python objects exist and forked
+	workers share the pages.
+	"""
+
+	def __init__(self, vocabulary: Sequence[str], idf: np.ndarray, stop_words: Optional[str] = "english", n_docs: int = 0):
+		if not (isinstance(vocabulary, np.ndarray) and vocabulary.dtype.kind == "U"):
+			vocabulary = np.asarray(vocabulary, dtype=str)
+		if vocabulary.size > 1 and not (vocabulary[1:] > vocabulary[:-1]).all():
+			order = np.argsort(vocabulary)
+			vocabulary, idf = vocabulary[order], np.asarray(idf)[order]
+		self.vocabulary = vocabulary
+		self.idf = idf
+		self.stop_words = stop_words
+		self.n_docs = n_docs
+		# Same tokenization as the per-pair TfidfVectorizer it replaces
+		self._analyze = CountVectorizer(stop_words=stop_words).build_analyzer()
+
+	@classmethod
+	def fit(cls, texts: Iterable[str], min_df: int = 2, max_features: Optional[int] = None) -> "ReferenceIdfModel":
+		vectorizer = TfidfVectorizer(stop_words="english", min_df=min_df, max_features=max_features, dtype=np.float32)
+		X = vectorizer.fit_transform(texts)
+		terms = vectorizer.get_feature_names_out()
+		return cls(terms.astype(str), vectorizer.idf_.astype(np.float32), "english", n_docs=X.shape[0])
+
+	def term_indices(self, tokens: Sequence[str]) -> np.ndarray:
+		"""Vocabulary index of each token, dropping out-of-vocabulary tokens."""
+		n = len(self.vocabulary)
+		if not tokens or not n:
+			return np.zeros(0, dtype=np.int64)
+		arr = np.asarray(tokens, dtype=str)
+		idx = np.searchsorted(self.vocabulary, arr)
+		found = idx < n
+		idx, arr = idx[found], arr[found]
+		return idx[self.vocabulary[idx] == arr]
+
+	def transform(self, texts: Sequence[str]) -> sparse.csr_matrix:
+		"""L2-normalized TF-IDF rows for `texts`."""
+		indptr = [0]
+		indices = []
+		counts = []
+		for text in texts:
+			terms, n = np.unique(self.term_indices(self._analyze(text or "")), return_counts=True)
+			indices.append(terms)
+			counts.append(n)
+			indptr.append(indptr[-1] + len(terms))
+		indices_arr = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+		# Gather only the weights of terms present; the (mmapped) IDF vector is never copied
+		data = np.concatenate(counts).astype(np.float64) * self.idf[indices_arr] if counts else np.zeros(0)
+		X = sparse.csr_matrix((data, indices_arr, indptr), shape=(len(texts), len(self.vocabulary)))
+		return normalize(X, norm="l2", copy=False)
+
+	def similarities(self, query: str, others: Sequence[str]) -> np.ndarray:
+		"""Cosine similarity (0-1) of `query` against each of `others` in one pass."""
+		if not others:
+			return np.zeros(0)
+		X = self.transform([query, *others])
+		return np.asarray((X[1:] @ X[0].T).todense()).ravel()
+
+	def save(self, path: str) -> None:
+		os.makedirs(path, exist_ok=True)
+		np.save(os.path.join(path, VOCAB_FILE), np.asarray(self.vocabulary, dtype=str))
+		np.save(os.path.join(path, IDF_FILE), np.asarray(self.idf, dtype=np.float32))
+		with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+			json.dump({"stop_words": self.stop_words, "n_docs": self.n_docs, "n_terms": len(self.vocabulary)}, f)
+
+	@classmethod
+	def load(cls, path: str, mmap: bool = True) -> "ReferenceIdfModel":
+		with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+			meta = json.load(f)
+		mode = "r" if mmap else None
+		vocabulary = np.load(os.path.join(path, VOCAB_FILE), mmap_mode=mode)
+		idf = np.load(os.path.join(path, IDF_FILE), mmap_mode=mode)
+		if len(vocabulary) != len(idf):
+			raise ValueError(f"IDF model at {path} is inconsistent: {len(vocabulary)} terms, {len(idf)} weights")
+		return cls(vocabulary, idf, meta.get("stop_words"), meta.get("n_docs", 0))
+
+
+if __name__ == "__main__":
+	import argparse
+
+	from src.fingerprint_index import iter_corpus_dir
+
+	parser = argparse.ArgumentParser(description="Fit a reference vocabulary + IDF model on a directory of .txt files.")
+	parser.add_argument("corpus_dir")
+	parser.add_argument("output_dir")
+	parser.add_argument("--min-df", type=int, default=2, help="Ignore terms in fewer documents than this")
+	parser.add_argument("--max-features", type=int, default=None, help="Keep only the most frequent terms")
+	args = parser.parse_args()
+
+	model = ReferenceIdfModel.fit((text for _, text in iter_corpus_dir(args.corpus_dir)), args.min_df, args.max_features)
+	model.save(args.output_dir)
+	print(f"Fitted {len(model.vocabulary)} terms on {model.n_docs} documents -> {args.output_dir}")
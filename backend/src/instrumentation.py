@@ -0,0 +1,127 @@
+import os
+import sys
+import time
+import threading
+import contextvars
+from collections import Counter as _StackCounter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+STAGE_SECONDS = Histogram(
+	"paper_stage_duration_seconds", "Time spent in each pipeline stage", ["stage"], buckets=_LATENCY_BUCKETS,
+)
+REQUEST_SECONDS = Histogram(
+	"paper_request_duration_seconds", "End-to-end request latency", ["path", "status"], buckets=_LATENCY_BUCKETS,
+)
+PDF_PAGES = Histogram(
+	"paper_pdf_pages", "Pages per extracted PDF", buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+CANDIDATES = Histogram(
+	"paper_search_candidates", "Candidate papers returned per section search", buckets=(0, 1, 2, 4, 8, 12, 16, 24),
+)
+CACHE_EVENTS = Counter(
+	"paper_cache_events_total", "Cache lookups by cache and outcome", ["cache", "result"],
+)
+
+# Spans recorded for the current request: (name, duration_ms). Set by the API
+# middleware; when unset (scripts, tests) spans only feed the histograms.
+_request_spans: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar("request_spans", default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+	"""Time a block as pipeline stage `name`."""
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		record_span(name, time.perf_counter() - start)
+
+
+def record_span(name: str, seconds: float) -> None:
+	"""Record a stage timing measured elsewhere (e.g. in a worker process)."""
+	STAGE_SECONDS.labels(stage=name).observe(seconds)
+	spans = _request_spans.get()
+	if spans is not None:
+		spans.append((name, seconds * 1000.0))
+
+
+def cache_event(cache: str, hit: bool) -> None:
+	CACHE_EVENTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def start_request() -> contextvars.Token:
+	"""Begin collecting spans for the current request context."""
+	return _request_spans.set([])
+
+
+def finish_request(token: contextvars.Token) -> List[Tuple[str, float]]:
+	spans = _request_spans.get() or []
+	_request_spans.reset(token)
+	return spans
+
+
+def server_timing(spans: List[Tuple[str, float]], total_ms: Optional[float] = None) -> str:
+	"""Render spans as a `Server-Timing` header, summing repeated stages."""
+	totals: Dict[str, float] = {}
+	counts: Dict[str, int] = {}
+	for name, ms in spans:
+		totals[name] = totals.get(name, 0.0) + ms
+		counts[name] = counts.get(name, 0) + 1
+	parts = []
+	for name, ms in totals.items():
+		desc = f';desc="x{counts[name]}"' if counts[name] > 1 else ""
+		parts.append(f"{name}{desc};dur={ms:.1f}")
+	if total_ms is not None:
+		parts.append(f"total;dur={total_ms:.1f}")
+	return ", ".join(parts)
+
+
+def submit_with_context(executor, fn, *args, **kwargs):
+	"""`executor.submit` that carries the caller's span collector into the worker thread."""
+	return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class SamplingProfiler:
+	"""Minimal wall-clock sampler for slow-path investigations.
+
+	A background thread snapshots every other thread's stack each `interval`
+	seconds; `folded()` returns the samples in collapsed-stack format, ready for
+	flamegraph.pl or speedscope.
+	"""
+
+	def __init__(self, interval: float = 0.005):
+		self.interval = interval
+		self.samples: _StackCounter = _StackCounter()
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	def _run(self) -> None:
+		me = threading.get_ident()
+		while not self._stop.wait(self.interval):
+			for ident, frame in sys._current_frames().items():
+				if ident == me:
+					continue
+				stack = []
+				while frame is not None:
+					code = frame.f_code
+					stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+					frame = frame.f_back
+				self.samples[";".join(reversed(stack))] += 1
+
+	def start(self) -> "SamplingProfiler":
+		self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+		self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join()
+
+	def folded(self) -> str:
+		return "\n".join(f"{stack} {n}" for stack, n in self.samples.most_common())
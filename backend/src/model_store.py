@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+
+# Root of the local artifact store: <root>/<name>/<version>/
+MODEL_STORE_DIR = os.environ.get("MODEL_STORE_DIR", "models")
+MANIFEST_FILE = "manifest.json"
+SKLEARN_FILE = "model.joblib"
+
+
+class ModelStore:
+	"""Versioned local store for trained models, in formats that load memory-mapped.
+
+	Each save creates a new integer version directory with a `manifest.json`.
+	scikit-learn objects are written with joblib uncompressed, so their numpy
+	arrays (vectorizer IDF, LR coefficients) are memory-mapped on load;
+	transformers are written as safetensors, which `from_pretrained` maps too.
+	Loaded models are cached per process, so every caller shares one copy and
+	forked workers share its pages.
+	"""
+
+	def __init__(self, root: str = None):
+		self.root = root or MODEL_STORE_DIR
+		self._loaded: Dict[Tuple[str, int], Any] = {}
+		self._lock = threading.Lock()
+
+	def versions(self, name: str) -> List[int]:
+		path = os.path.join(self.root, name)
+		if not os.path.isdir(path):
+			return []
+		return sorted(int(v) for v in os.listdir(path) if v.isdigit() and os.path.exists(os.path.join(path, v, MANIFEST_FILE)))
+
+	def latest_version(self, name: str) -> Optional[int]:
+		versions = self.versions(name)
+		return versions[-1] if versions else None
+
+	def path(self, name: str, version: Optional[int] = None) -> str:
+		version = self.latest_version(name) if version is None else version
+		if version is None:
+			raise FileNotFoundError(f"No saved versions of model '{name}' in {self.root}")
+		return os.path.join(self.root, name, str(version))
+
+	def manifest(self, name: str, version: Optional[int] = None) -> Dict[str, Any]:
+		with open(os.path.join(self.path(name, version), MANIFEST_FILE), "r", encoding="utf-8") as f:
+			return json.load(f)
+
+	def _new_version_dir(self, name: str) -> Tuple[int, str]:
+		version = (self.latest_version(name) or 0) + 1
+		path = os.path.join(self.root, name, str(version))
+		os.makedirs(path)
+		return version, path
+
+	def _write_manifest(self, path: str, name: str, version: int, kind: str, metadata: Optional[Dict[str, Any]]) -> None:
+		manifest = {"name": name, "version": version, "kind": kind, "created": time.time(), "metadata": metadata or {}}
+		with open(os.path.join(path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+			json.dump(manifest, f, indent=2)  # written last: a version without it is incomplete and ignored
+
+	def save_sklearn(self, name: str, objects: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> int:
+		"""Save a dict of fitted scikit-learn objects as a new version; returns the version."""
+		version, path = self._new_version_dir(name)
+		joblib.dump(objects, os.path.join(path, SKLEARN_FILE))
+		self._write_manifest(path, name, version, "sklearn", metadata)
+		return version
+
+	def save_transformer(self, name: str, model: Any, tokenizer: Any, metadata: Optional[Dict[str, Any]] = None) -> int:
+		"""Save a Hugging Face model (as safetensors) and its tokenizer as a new version."""
+		version, path = self._new_version_dir(name)
+		model.save_pretrained(path, safe_serialization=True)
+		tokenizer.save_pretrained(path)
+		self._write_manifest(path, name, version, "transformer", metadata)
+		return version
+
+	def load(self, name: str, version: Optional[int] = None) -> Any:
+		"""Load a saved model once per process and return the shared instance.
+
+		scikit-learn artifacts come back as the saved dict; transformers as a
+		`(model, tokenizer)` pair in eval mode.
+		"""
+		version = self.latest_version(name) if version is None else version
+		key = (name, version)
+		if key not in self._loaded:
+			with self._lock:
+				if key not in self._loaded:
+					self._loaded[key] = self._load(name, version)
+		return self._loaded[key]
+
+	def _load(self, name: str, version: Optional[int]) -> Any:
+		path = self.path(name, version)
+		kind = self.manifest(name, version)["kind"]
+		if kind == "sklearn":
+			return joblib.load(os.path.join(path, SKLEARN_FILE), mmap_mode="r")
+		if kind == "transformer":
+			from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+			model = AutoModelForSequenceClassification.from_pretrained(path)
+			model.eval()
+			return model, AutoTokenizer.from_pretrained(path)
+		raise ValueError(f"Unknown artifact kind '{kind}' for model '{name}'")
+
+
+_store: Optional[ModelStore] = None
+_store_lock = threading.Lock()
+
+
+def get_model_store() -> ModelStore:
+	"""Process-wide store rooted at MODEL_STORE_DIR."""
+	global _store
+	if _store is None:
+		with _store_lock:
+			if _store is None:
+				_store = ModelStore()
+	return _store
@@ -0,0 +1,261 @@
+import io
+import os
+import re
+import threading
+from contextlib import ExitStack, closing
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+
+from src.instrumentation import PDF_PAGES, span
+
+try:
+	import pypdfium2 as pdfium
+except ImportError:  # optional fast engine; pdfplumber handles everything without it
+	pdfium = None
+
+# Input limits: longer PDFs are truncated
+MAX_PDF_PAGES = int(os.environ.get("MAX_PDF_PAGES", "300"))
+MAX_TEXT_CHARS = int(os.environ.get("MAX_TEXT_CHARS", "2000000"))
+# "auto" uses pdfium when installed, else pdfplumber
+PDF_BACKEND = os.environ.get("PDF_BACKEND", "auto")
+
+_LONG_RUN = re.compile(r"\S{40,}")
+
+
+def page_text_ok(text: str) -> bool:
+	"""Quality check for a fast-engine page: enough text, sane spacing, no garbage glyphs."""
+	stripped = text.strip()
+	if len(stripped) < 80:
+		return False
+	if stripped.count("�") > len(stripped) // 100:
+		return False
+	# Missing inter-word spaces show up as very long unbroken runs
+	return len(_LONG_RUN.findall(stripped)) <= max(1, len(stripped) // 2000)
+
+
+class _FileView:
+	"""Read-only view with its own position over a file shared with another reader.
+
+	pdfminer relies on the file position between reads, while PDFium seeks the
+	same file on every read; giving the fallback engine its own view keeps the
+	two from disturbing each other.
+	"""
+
+	def __init__(self, fileobj: BinaryIO):
+		self._f = fileobj
+		self._pos = 0
+
+	def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+		if whence == io.SEEK_SET:
+			self._pos = offset
+		elif whence == io.SEEK_CUR:
+			self._pos += offset
+		else:
+			self._pos = self._f.seek(0, io.SEEK_END) + offset
+		return self._pos
+
+	def tell(self) -> int:
+		return self._pos
+
+	def read(self, size: int = -1) -> bytes:
+		self._f.seek(self._pos)
+		data = self._f.read(size)
+		self._pos += len(data)
+		return data
+
+	def readable(self) -> bool:
+		return True
+
+	def seekable(self) -> bool:
+		return True
+
+
+class PdfTextBackend:
+	"""Extracts text from one opened PDF, one page at a time.
+
+	Subclasses implement `page_count` and `page_text`; use as a context manager
+	so native handles are released.
+	"""
+
+	name = "base"
+
+	def __init__(self, fileobj: BinaryIO, max_pages: int):
+		self.fileobj = fileobj
+		self.max_pages = max_pages
+
+	def __enter__(self) -> "PdfTextBackend":
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self.close()
+
+	def close(self) -> None:
+		pass
+
+	@property
+	def page_count(self) -> int:
+		raise NotImplementedError
+
+	def page_text(self, index: int) -> str:
+		raise NotImplementedError
+
+
+class PdfplumberBackend(PdfTextBackend):
+	"""pdfplumber, falling back to joined word boxes when spacing is broken."""
+
+	name = "pdfplumber"
+
+	def __init__(self, fileobj: BinaryIO, max_pages: int):
+		super().__init__(fileobj, max_pages)
+		self.pdf = pdfplumber.open(fileobj, pages=range(1, max_pages + 1))
+
+	def close(self) -> None:
+		self.pdf.close()
+
+	@property
+	def page_count(self) -> int:
+		try:
+			return int(resolve1(self.pdf.doc.catalog["Pages"])["Count"])
+		except Exception:
+			return len(self.pdf.pages)
+
+	def page_text(self, index: int) -> str:
+		page = self.pdf.pages[index]
+		try:
+			page_text = page.extract_text() or ""
+			if len(page_text.strip()) < 80:
+				try:
+					words = page.extract_words()
+					if words:
+						page_text = " ".join(w.get("text", "") for w in words)
+				except Exception:
+					pass
+			return page_text
+		finally:
+			page.close()
+
+
+class PdfiumBackend(PdfTextBackend):
+	"""PDFium via pypdfium2: native text extraction, several times faster than pdfplumber."""
+
+	name = "pdfium"
+	# PDFium is not thread-safe; serialize calls into it across request threads
+	_lock = threading.Lock()
+
+	def __init__(self, fileobj: BinaryIO, max_pages: int):
+		if pdfium is None:
+			raise RuntimeError("pypdfium2 is not installed")
+		super().__init__(fileobj, max_pages)
+		with self._lock:
+			self.pdf = pdfium.PdfDocument(fileobj)
+
+	def close(self) -> None:
+		with self._lock:
+			self.pdf.close()
+
+	@property
+	def page_count(self) -> int:
+		with self._lock:
+			return len(self.pdf)
+
+	def page_text(self, index: int) -> str:
+		with self._lock:
+			page = self.pdf[index]
+			try:
+				textpage = page.get_textpage()
+				try:
+					text = textpage.get_text_range()
+				finally:
+					textpage.close()
+			finally:
+				page.close()
+		return text.replace("\r\n", "\n").replace("\r", "\n").strip("\n")
+
+
+BACKENDS = {"pdfplumber": PdfplumberBackend, "pdfium": PdfiumBackend}
+
+
+def default_backend() -> str:
+	if PDF_BACKEND != "auto":
+		return PDF_BACKEND
+	return "pdfium" if pdfium is not None else "pdfplumber"
+
+
+def iter_page_texts(fileobj: BinaryIO, max_pages: int, backend: str) -> Iterator[Tuple[int, int, str, str]]:
+	"""Yield (index, total_pages, text, engine) per page.
+
+	With a fast backend, pages that fail `page_text_ok` are re-extracted with
+	pdfplumber, which is opened lazily only if such a page turns up.
+	"""
+	if backend == "pdfplumber":
+		with PdfplumberBackend(fileobj, max_pages) as primary:
+			total = primary.page_count
+			for i in range(min(total, max_pages)):
+				yield i, total, primary.page_text(i), primary.name
+		return
+
+	fallback: Optional[PdfplumberBackend] = None
+	try:
+		with BACKENDS[backend](fileobj, max_pages) as primary:
+			total = primary.page_count
+			for i in range(min(total, max_pages)):
+				text = primary.page_text(i)
+				if page_text_ok(text):
+					yield i, total, text, primary.name
+					continue
+				if fallback is None:
+					fallback = PdfplumberBackend(_FileView(fileobj), max_pages)
+				yield i, total, fallback.page_text(i), fallback.name
+	finally:
+		if fallback is not None:
+			fallback.close()
+
+
+@span("pdf_extract")
+def extract_pdf_text(source: Union[bytes, str, os.PathLike, BinaryIO], max_pages: int = None, max_chars: int = None,
+					 backend: str = None) -> Tuple[str, Dict[str, object]]:
+	"""Extract text page by page from a PDF given as bytes, a path or a seekable file.
+
+	Only the first `max_pages` pages are parsed, extraction stops once `max_chars`
+	characters have been collected, and per-page state is released as soon as its
+	text is taken, so memory stays bounded for very large documents.
+	"""
+	max_pages = MAX_PDF_PAGES if max_pages is None else max_pages
+	max_chars = MAX_TEXT_CHARS if max_chars is None else max_chars
+	backend = backend or default_backend()
+	parts: List[str] = []
+	chars = 0
+	pages_read = 0
+	total = 0
+	fallback_pages = 0
+	with ExitStack() as stack:
+		if isinstance(source, (bytes, bytearray)):
+			fileobj = io.BytesIO(source)
+		elif isinstance(source, (str, os.PathLike)):
+			# The pdfplumber fallback needs a real file object to seek, not a path
+			fileobj = stack.enter_context(open(source, "rb"))
+		else:
+			fileobj = source
+		pages = stack.enter_context(closing(iter_page_texts(fileobj, max_pages, backend)))
+		for _, total, page_text, engine in pages:
+			if pages_read == 0:
+				PDF_PAGES.observe(total)
+			pages_read += 1
+			fallback_pages += engine != backend
+			if page_text:
+				parts.append(page_text)
+				parts.append("\n")
+				chars += len(page_text) + 1
+			if chars >= max_chars:
+				break
+	text = "".join(parts)
+	truncated = pages_read < total or len(text) > max_chars
+	return text[:max_chars], {
+		"pages": total,
+		"pages_read": pages_read,
+		"truncated": truncated,
+		"backend": backend,
+		"fallback_pages": fallback_pages,
+	}
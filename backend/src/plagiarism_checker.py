@@ -1,78 +1,76 @@
+import os
 import re
+import copy
 import math
-import requests
-from typing import Dict, List, Tuple
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
-SEMANTIC_SCHOLAR_SEARCH = "https://api.semanticscholar.org/graph/v1/paper/search"
-OPENALEX_SEARCH = "https://api.openalex.org/works"
+from src.document import Document, normalize_whitespace as _normalize_whitespace
+from src.fingerprint_index import FingerprintIndex, FingerprintJournal, fingerprint
+from src.idf_model import META_FILE, ReferenceIdfModel
+from src.instrumentation import CANDIDATES, cache_event, span
+from src.provider_client import ProviderClient
+from src.shared_cache import SharedCache
 
+# Overridable so benchmarks/tests can point at a local mock API
+SEMANTIC_SCHOLAR_SEARCH = os.environ.get("SEMANTIC_SCHOLAR_SEARCH_URL", "https://api.semanticscholar.org/graph/v1/paper/search")
+OPENALEX_SEARCH = os.environ.get("OPENALEX_SEARCH_URL", "https://api.openalex.org/works")
+# Seconds after which a slow provider call is hedged with a duplicate request (unset = off)
+PROVIDER_HEDGE_AFTER_S = float(os.environ.get("PROVIDER_HEDGE_AFTER_S") or 0) or None
 
-def _normalize_whitespace(text: str) -> str:
-	"""Collapse multiple spaces/newlines and strip."""
-	if not text:
-		return ""
-	text = re.sub(r"[\u00A0\t]+", " ", text)
-	text = re.sub(r"\s+", " ", text)
-	return text.strip()
+SEMANTIC_SCHOLAR = ProviderClient("semantic_scholar", SEMANTIC_SCHOLAR_SEARCH, hedge_after=PROVIDER_HEDGE_AFTER_S)
+OPENALEX = ProviderClient("openalex", OPENALEX_SEARCH, hedge_after=PROVIDER_HEDGE_AFTER_S)
+# Optional .npz fingerprint index built from the reference corpus (see src/fingerprint_index.py)
+FINGERPRINT_INDEX_PATH = os.environ.get("FINGERPRINT_INDEX_PATH", "")
+# With several workers (gunicorn.conf.py) index additions go through a shared
+# SQLite journal so every worker sees them; the server merges it into the index file
+FINGERPRINT_JOURNAL_PATH = os.environ.get("FINGERPRINT_JOURNAL_PATH", "")
+_fingerprint_journal = FingerprintJournal(FINGERPRINT_JOURNAL_PATH) if FINGERPRINT_JOURNAL_PATH else None
+
+# Optional SQLite file caching provider search results, shared by all worker processes
+SEARCH_CACHE_PATH = os.environ.get("SEARCH_CACHE_PATH", "")
+SEARCH_CACHE_TTL_S = float(os.environ.get("SEARCH_CACHE_TTL_S", "86400"))
+_search_cache = SharedCache(SEARCH_CACHE_PATH, "search", ttl=SEARCH_CACHE_TTL_S) if SEARCH_CACHE_PATH else None
+# Per-section results are memoized by the hash of the section text, so a revised
+# submission only re-queries the sections that changed. Entries live in this
+# process (SECTION_MEMO_SIZE) and, when SECTION_CACHE_PATH is set, in a SQLite
+# file shared by all workers (defaults to the search cache file); both expire
+# after SECTION_CACHE_TTL_S.
+SECTION_MEMO_SIZE = int(os.environ.get("SECTION_MEMO_SIZE", "512"))
+SECTION_CACHE_PATH = os.environ.get("SECTION_CACHE_PATH", SEARCH_CACHE_PATH)
+SECTION_CACHE_TTL_S = float(os.environ.get("SECTION_CACHE_TTL_S", str(SEARCH_CACHE_TTL_S)))
+_section_cache = SharedCache(SECTION_CACHE_PATH, "section", ttl=SECTION_CACHE_TTL_S) if SECTION_CACHE_PATH else None
+_section_memo: "OrderedDict[str, Tuple[float, Dict[str, object]]]" = OrderedDict()  # key -> (expires, result)
+_section_memo_lock = threading.Lock()
+# Optional reference IDF model directory (see src/idf_model.py); without it each
+# comparison fits IDF on just the two texts being compared
+IDF_MODEL_PATH = os.environ.get("IDF_MODEL_PATH", "")
 
+_fingerprint_index: Optional[FingerprintIndex] = None
+_idf_model: Optional[ReferenceIdfModel] = None
+_idf_model_tag = ""
+_idf_model_lock = threading.Lock()
 
-def extract_sections(full_text: str) -> Dict[str, str]:
+
+def extract_sections(full_text: Union[Document, str]) -> Dict[str, str]:
 	"""Extract Title, Abstract, Methodology, Conclusions using simple heuristics.
 	- Title: first non-empty line (<= 200 chars)
-	- Abstract/Methodology/Conclusions: by heading regex variants
+	- Abstract/Methodology/Conclusions: text between their heading and the next
+	  recognised heading (see `Document.heading_map`), with positional fallbacks
 	"""
-	text = full_text or ""
-	lines = [l.strip() for l in text.splitlines()]
-	title = next((l for l in lines if l and len(l) <= 200), "Untitled")
-
-	# Build a case-insensitive marker-based split
-	markers = [
-		("abstract", "Abstract"),
-		("methodology|methods|materials and methods|experimental setup|approach", "Methodology"),
-		("conclusion|conclusions|discussion and conclusion|summary", "Conclusions"),
-	]
-	sections: Dict[str, str] = {"Title": title, "Abstract": "", "Methodology": "", "Conclusions": ""}
-
-	lower = text.lower()
-	indices: Dict[str, int] = {}
-	for pattern, key in markers:
-		m = re.search(rf"\n\s*(?:\d+\.?\s*)?(?:{pattern})\s*\n", lower, re.IGNORECASE)
-		if m:
-			indices[key] = m.start()
-
-	# Determine spans between markers
-	ordered = sorted(indices.items(), key=lambda kv: kv[1])
-	spans: List[Tuple[str, int, int]] = []
-	for i, (name, start) in enumerate(ordered):
-		end = ordered[i + 1][1] if i + 1 < len(ordered) else len(text)
-		spans.append((name, start, end))
-
-	for name, start, end in spans:
-		content = _normalize_whitespace(text[start:end])
-		# Remove the heading itself (first line)
-		content = re.sub(r"^.{0,120}?\b(?i:" + name.lower() + r")\b[:\s-]*", "", content, flags=re.IGNORECASE)
-		sections[name] = content.strip()
-
-	# Fallbacks: if markers not found, approximate by paragraphs
-	if not sections["Abstract"]:
-		sections["Abstract"] = _normalize_whitespace(" ".join(lines[:200]))[:1500]
-	if not sections["Methodology"]:
-		sections["Methodology"] = _normalize_whitespace(" ".join(lines[200:800]))[:3000]
-	if not sections["Conclusions"]:
-		sections["Conclusions"] = _normalize_whitespace(" ".join(lines[-400:]))[:2000]
-
-	return sections
+	return Document.ensure(full_text).sections
 
 
 def _semantic_scholar_search(qt: str, max_results: int) -> List[Dict[str, str]]:
 	params = {"query": qt, "limit": max_results, "fields": "title,url,abstract"}
-	resp = requests.get(SEMANTIC_SCHOLAR_SEARCH, params=params, timeout=12)
-	resp.raise_for_status()
-	data = resp.json() or {}
+	data = SEMANTIC_SCHOLAR.get_json(params)
 	results = []
 	for item in data.get("data", []):
 		results.append({
@@ -83,21 +81,41 @@ def _semantic_scholar_search(qt: str, max_results: int) -> List[Dict[str, str]]:
 	return results
 
 
+def decode_inverted_abstract(inverted: Optional[Dict[str, List[int]]]) -> str:
+	"""Rebuild an OpenAlex abstract from its word -> positions index, in reading order.
+
+	Positions are sorted rather than used as list indexes, so a malformed huge or
+	negative position cannot trigger a giant allocation.
+	"""
+	if not inverted:
+		return ""
+	by_position: Dict[int, str] = {}
+	for word, positions in inverted.items():
+		for p in positions or ():
+			if isinstance(p, int) and p >= 0:
+				by_position[p] = word
+	return " ".join(by_position[p] for p in sorted(by_position))
+
+
 def _openalex_search(qt: str, max_results: int) -> List[Dict[str, str]]:
-	params = {"search": qt, "per_page": max_results}
-	resp = requests.get(OPENALEX_SEARCH, params=params, timeout=12)
-	resp.raise_for_status()
-	data = resp.json() or {}
+	# `select` trims each work to the three fields we score on instead of the full object
+	params = {"search": qt, "per_page": max_results, "select": "id,title,abstract_inverted_index"}
+	data = OPENALEX.get_json(params)
 	results = []
 	for item in data.get("results", []):
 		results.append({
 			"title": (item.get("title") or "Untitled"),
 			"url": (item.get("id") or ""),
-			"abstract": (item.get("abstract_inverted_index") and " ".join(sorted(item["abstract_inverted_index"].keys()))) or ""
+			"abstract": decode_inverted_abstract(item.get("abstract_inverted_index"))
 		})
 	return results
 
 
+def provider_health() -> Dict[str, Dict[str, object]]:
+	"""Per-provider request/retry/failure counters and circuit state."""
+	return {client.name: client.stats() for client in (SEMANTIC_SCHOLAR, OPENALEX)}
+
+
 def _build_queries(section_text: str) -> List[str]:
 	# Build progressively shorter/cleaner queries to improve hit rate
 	s = _normalize_whitespace(section_text)
@@ -112,6 +130,18 @@ def _build_queries(section_text: str) -> List[str]:
 	return [q for q in queries if q]
 
 
+def _cached_search(provider: str, q: str, max_results: int) -> List[Dict[str, str]]:
+	search = _semantic_scholar_search if provider == "ss" else _openalex_search
+	if _search_cache is None:
+		return search(q, max_results)
+	key = SharedCache.make_key(provider, q, max_results)
+	results = _search_cache.get(key)
+	if results is None:
+		results = search(q, max_results)
+		_search_cache.set(key, results)
+	return results
+
+
 def search_related_papers(query_text: str, max_results: int = 8) -> List[Dict[str, str]]:
 	"""Search multiple scholarly APIs with robust query fallback."""
 	queries = _build_queries(query_text)
@@ -120,7 +150,7 @@ def search_related_papers(query_text: str, max_results: int = 8) -> List[Dict[st
 	for q in queries:
 		for provider in ("ss", "oa"):
 			try:
-				results = _semantic_scholar_search(q, max_results) if provider == "ss" else _openalex_search(q, max_results)
+				results = _cached_search(provider, q, max_results)
 				for r in results:
 					key = (r.get("title"), r.get("url"))
 					if key not in seen and r.get("url"):
@@ -133,8 +163,32 @@ def search_related_papers(query_text: str, max_results: int = 8) -> List[Dict[st
 	return out[:max_results]
 
 
+def get_idf_model() -> Optional[ReferenceIdfModel]:
+	"""Process-wide reference IDF model, loaded (memory-mapped) from IDF_MODEL_PATH once."""
+	global _idf_model, _idf_model_tag
+	if _idf_model is None and IDF_MODEL_PATH:
+		with _idf_model_lock:
+			if _idf_model is None:
+				mtime = os.path.getmtime(os.path.join(IDF_MODEL_PATH, META_FILE))
+				model = ReferenceIdfModel.load(IDF_MODEL_PATH)
+				_idf_model_tag = f"{IDF_MODEL_PATH}:{mtime}:{model.n_docs}:{len(model.vocabulary)}"
+				_idf_model = model
+	return _idf_model
+
+
+def similarity_percents(query: str, others: List[str]) -> List[float]:
+	"""Similarity of `query` against each of `others`, in percent 0-100."""
+	model = get_idf_model()
+	if model is None:
+		return [similarity_percent(query, o) for o in others]
+	return [max(0.0, min(1.0, float(sim))) * 100.0 for sim in model.similarities(query or "", others)]
+
+
 def similarity_percent(a: str, b: str) -> float:
 	"""TF-IDF cosine similarity converted to percent 0-100."""
+	model = get_idf_model()
+	if model is not None:
+		return similarity_percents(a, [b])[0]
 	texts = [a or "", b or ""]
 	vectorizer = TfidfVectorizer(stop_words="english")
 	try:
@@ -155,12 +209,12 @@ def categorize_similarity(pct: float) -> str:
 
 def analyze_section(section_text: str, top_k: int = 5) -> Dict[str, object]:
 	"""Search for related papers and score similarity against each. Return top matches."""
-	candidates = search_related_papers(section_text, max_results=12)
-	scored: List[Tuple[float, Dict[str, str]]] = []
-	for paper in candidates:
-		content = f"{paper.get('title','')}\n{paper.get('abstract','')}"
-		pct = similarity_percent(section_text, content)
-		scored.append((pct, paper))
+	with span("search"):
+		candidates = search_related_papers(section_text, max_results=12)
+	CANDIDATES.observe(len(candidates))
+	with span("scoring"):
+		contents = [f"{paper.get('title','')}\n{paper.get('abstract','')}" for paper in candidates]
+		scored = list(zip(similarity_percents(section_text, contents), candidates))
 	# Sort high to low
 	scored.sort(key=lambda x: x[0], reverse=True)
 	top = scored[:top_k]
@@ -179,23 +233,201 @@ def analyze_section(section_text: str, top_k: int = 5) -> Dict[str, object]:
 	}
 
 
-def analyze_plagiarism(full_text: str) -> Dict[str, object]:
-	"""Analyze Title, Abstract, Methodology, Conclusions for similarity and provide links."""
-	sections = extract_sections(full_text)
+def section_key(section_text: str, top_k: int = 5) -> str:
+	"""Memo key: hash of the normalized section text plus everything that changes its scores.
+
+	The IDF model is identified by what was actually loaded (file mtime, corpus
+	size, vocabulary size), so rebuilding it in place invalidates old entries.
+	"""
+	normalized = _normalize_whitespace(section_text or "").lower()
+	model_tag = _idf_model_tag if get_idf_model() is not None else ""
+	return hashlib.sha1(f"{model_tag}\x00{top_k}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+def _memo_get(key: str) -> Optional[Dict[str, object]]:
+	with _section_memo_lock:
+		entry = _section_memo.get(key)
+		if entry is not None and entry[0] <= time.time():
+			del _section_memo[key]
+			entry = None
+		if entry is not None:
+			_section_memo.move_to_end(key)
+	if entry is not None:
+		cache_event("section", True)
+		return entry[1]
+	if _section_cache is None:
+		cache_event("section", False)
+		return None
+	result = _section_cache.get(key)  # records the hit/miss itself
+	if result is not None:
+		_memo_put(key, result)
+	return result
+
+
+def _memo_put(key: str, result: Dict[str, object]) -> None:
+	with _section_memo_lock:
+		_section_memo[key] = (time.time() + SECTION_CACHE_TTL_S, result)
+		_section_memo.move_to_end(key)
+		while len(_section_memo) > SECTION_MEMO_SIZE:
+			_section_memo.popitem(last=False)
+
+
+def clear_section_memo() -> None:
+	"""Forget this process's memoized section results (the shared SQLite cache is left alone)."""
+	with _section_memo_lock:
+		_section_memo.clear()
+
+
+def analyze_section_memoized(section_text: str, top_k: int = 5) -> Tuple[Dict[str, object], bool]:
+	"""`analyze_section` with results reused for unchanged section text.
+
+	Returns (result, reused). A non-empty section that found no candidates is not
+	stored, so a provider outage is retried on the next upload instead of being
+	remembered as "no similar papers".
+	"""
+	key = section_key(section_text, top_k)
+	cached = _memo_get(key)
+	if cached is not None:
+		return copy.deepcopy(cached), True
+	result = analyze_section(section_text, top_k)
+	if result["matches"] or not (section_text or "").strip():
+		_memo_put(key, result)
+		if _section_cache is not None:
+			_section_cache.set(key, result)
+		result = copy.deepcopy(result)
+	return result, False
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+	"""Process-wide fingerprint index, loaded from FINGERPRINT_INDEX_PATH on first use.
+
+	With a journal configured, documents indexed by other workers are applied first.
+	"""
+	global _fingerprint_index
+	if _fingerprint_index is None:
+		if FINGERPRINT_INDEX_PATH and os.path.exists(FINGERPRINT_INDEX_PATH):
+			_fingerprint_index = FingerprintIndex.load(FINGERPRINT_INDEX_PATH)
+		else:
+			_fingerprint_index = FingerprintIndex()
+	if _fingerprint_journal is not None:
+		_fingerprint_journal.sync(_fingerprint_index)
+	return _fingerprint_index
+
+
+def index_document(doc_id: str, text: str, replace: bool = False) -> None:
+	"""Add a submission to the index (via the shared journal, if any) so later uploads are checked against it.
+
+	With `replace`, `doc_id` names a submission lineage and `text` supersedes its
+	earlier version rather than becoming another source.
+	"""
+	index = get_fingerprint_index()
+	if doc_id in index and not replace:
+		return
+	prints = fingerprint(text, index.k, index.w)
+	if _fingerprint_journal is None:
+		index.add_fingerprints(doc_id, prints, replace)
+		return
+	_fingerprint_journal.append(doc_id, prints, replace)
+	_fingerprint_journal.sync(index)
+
+
+def save_fingerprint_index() -> None:
+	"""Write the index (including submissions added since startup) back to disk.
+
+	In multi-worker mode workers do not save: their additions are in the journal,
+	which `merge_fingerprint_journal` folds into the file from the server master.
+	"""
+	if _fingerprint_journal is not None:
+		return
+	if FINGERPRINT_INDEX_PATH and _fingerprint_index is not None:
+		_fingerprint_index.save(FINGERPRINT_INDEX_PATH)
+
+
+def merge_fingerprint_journal() -> None:
+	"""Fold every worker's journaled additions into FINGERPRINT_INDEX_PATH (run once, at server exit)."""
+	if _fingerprint_journal is not None and FINGERPRINT_INDEX_PATH:
+		_fingerprint_journal.merge_into_file(get_fingerprint_index(), FINGERPRINT_INDEX_PATH)
+
+
+def document_id(full_text: Union[Document, str]) -> str:
+	return hashlib.sha1(Document.ensure(full_text).normalized.lower().encode("utf-8")).hexdigest()
+
+
+def find_local_matches(full_text: str, doc_id: str, max_passages: int = 20) -> Dict[str, object]:
+	"""Passage-level verbatim overlap against the local corpus and earlier submissions."""
+	index = get_fingerprint_index()
+	passages = index.query(full_text, exclude=doc_id)
+	covered = 0
+	last_end = 0
+	for start, end in sorted((p["start"], p["end"]) for p in passages):
+		start = max(start, last_end)
+		if end > start:
+			covered += end - start
+			last_end = end
+	for p in passages:
+		p["text"] = str(p["text"])[:500]
+	return {
+		"doc_id": doc_id,
+		"covered_percent": round(100.0 * covered / max(1, len(full_text)), 2),
+		"passages": passages[:max_passages],
+	}
+
+
+SECTION_NAMES = ["Title", "Abstract", "Methodology", "Conclusions"]
+# Overall as weighted average favoring Abstract and Methodology
+SECTION_WEIGHTS = np.array([0.1, 0.4, 0.4, 0.1])
+
+
+def build_plagiarism_report(doc: Document, section_results: Dict[str, Dict[str, object]], doc_id: Optional[str] = None,
+							reused_sections: Optional[List[str]] = None) -> Dict[str, object]:
+	"""Assemble the report from per-section `analyze_section` results.
+
+	Sections missing from `section_results` (e.g. cut off by a time budget) are
+	listed under `missing_sections` and the overall score is re-weighted over the
+	sections that did complete. `reused_sections` names the sections whose
+	results came from the memo rather than fresh searches.
+
+	A caller-supplied `doc_id` identifies a submission across revisions: its
+	earlier version is excluded from the local matches and then replaced in the
+	index. Without one the id is a hash of the text.
+	"""
+	lineage = doc_id is not None
+	doc_id = doc_id or document_id(doc)
 	report: Dict[str, object] = {"sections": {}, "overall_percent": 0.0}
-	percents: List[float] = []
-	for name in ["Title", "Abstract", "Methodology", "Conclusions"]:
-		result = analyze_section(sections.get(name, ""))
-		report["sections"][name] = result
-		percents.append(result["best_similarity_percent"])  # simple aggregation: max per section
-	# Overall as weighted average favoring Abstract and Methodology
-	weights = np.array([0.1, 0.4, 0.4, 0.1])
-	values = np.array([
-		report["sections"]["Title"]["best_similarity_percent"],
-		report["sections"]["Abstract"]["best_similarity_percent"],
-		report["sections"]["Methodology"]["best_similarity_percent"],
-		report["sections"]["Conclusions"]["best_similarity_percent"],
-	])
-	report["overall_percent"] = float(np.round(np.dot(weights, values), 2))
+	done = [name in section_results for name in SECTION_NAMES]
+	for name in SECTION_NAMES:
+		if name in section_results:
+			report["sections"][name] = section_results[name]
+	if any(done):
+		mask = np.array(done)
+		weights = SECTION_WEIGHTS[mask] / SECTION_WEIGHTS[mask].sum()
+		values = np.array([section_results[name]["best_similarity_percent"] for name in SECTION_NAMES if name in section_results])
+		report["overall_percent"] = float(np.round(np.dot(weights, values), 2))
 	report["overall_category"] = categorize_similarity(report["overall_percent"])
+	report["reused_sections"] = [name for name in SECTION_NAMES if name in (reused_sections or [])]
+	if not all(done):
+		report["missing_sections"] = [name for name in SECTION_NAMES if name not in section_results]
+	with span("fingerprint"):
+		report["local_matches"] = find_local_matches(doc.raw, doc_id)
+		index_document(doc_id, doc.raw, replace=lineage)
 	return report
+
+
+def analyze_plagiarism(full_text: Union[Document, str], doc_id: Optional[str] = None) -> Dict[str, object]:
+	"""Analyze Title, Abstract, Methodology, Conclusions for similarity and provide links.
+
+	Also reports verbatim passages shared with the local fingerprint index, then
+	adds this paper to the index so later submissions are checked against it
+	(`doc_id`: see `build_plagiarism_report`). Sections unchanged since an
+	earlier upload reuse their previous results.
+	"""
+	doc = Document.ensure(full_text)
+	with span("sections"):
+		sections = doc.sections
+	results: Dict[str, Dict[str, object]] = {}
+	reused: List[str] = []
+	for name in SECTION_NAMES:
+		results[name], was_reused = analyze_section_memoized(sections.get(name, ""))
+		if was_reused:
+			reused.append(name)
+	return build_plagiarism_report(doc, results, doc_id, reused)
@@ -0,0 +1,221 @@
+import time
+import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.instrumentation import span
+
+try:
+	import orjson
+	_json_loads = orjson.loads
+except ImportError:  # optional speedup; fall back to the stdlib decoder
+	import json
+	_json_loads = json.loads
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class ProviderUnavailable(Exception):
+	"""Raised without touching the network while a provider's circuit is open."""
+
+
+class CircuitBreaker:
+	"""Opens after `threshold` consecutive failures and stays open for `cooldown` seconds.
+
+	Once the cooldown has passed a single trial call is let through (half-open);
+	its outcome closes the circuit again or restarts the cooldown.
+	"""
+
+	def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+		self.threshold = threshold
+		self.cooldown = cooldown
+		self.failures = 0
+		self.opened_at: Optional[float] = None
+		self._trial_in_flight = False
+		self._lock = threading.Lock()
+
+	@property
+	def state(self) -> str:
+		if self.opened_at is None:
+			return "closed"
+		if time.monotonic() - self.opened_at >= self.cooldown:
+			return "half-open"
+		return "open"
+
+	def allow(self) -> bool:
+		with self._lock:
+			state = self.state
+			if state == "closed":
+				return True
+			if state == "half-open" and not self._trial_in_flight:
+				self._trial_in_flight = True
+				return True
+			return False
+
+	def record_success(self) -> None:
+		with self._lock:
+			self.failures = 0
+			self.opened_at = None
+			self._trial_in_flight = False
+
+	def record_failure(self) -> None:
+		with self._lock:
+			self.failures += 1
+			if self._trial_in_flight or self.failures >= self.threshold:
+				self.opened_at = time.monotonic()
+			self._trial_in_flight = False
+
+
+def _retry_after_seconds(resp: requests.Response) -> Optional[float]:
+	value = resp.headers.get("Retry-After")
+	if not value:
+		return None
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+	try:
+		return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+	except (TypeError, ValueError):
+		return None
+
+
+class ProviderClient:
+	"""Keep-alive HTTP client for one scholarly API.
+
+	- one pooled `requests.Session` per provider (connections are reused across calls)
+	- retries on 429/5xx and refused/reset connections with exponential backoff +
+	  jitter, honoring `Retry-After` (capped at `max_backoff`); timeouts are not
+	  retried, and no retry starts once `max_call_s` would be exceeded
+	- a circuit breaker that skips the provider for a while after repeated failures;
+	  every failed attempt counts, so an outage opens it after a few calls
+	- optional hedging: if a call has not answered after `hedge_after` seconds a
+	  second identical request is sent and whichever finishes first wins
+	"""
+
+	def __init__(self, name: str, base_url: str, timeout: float = 12.0, max_retries: int = 2,
+				 backoff: float = 0.5, max_backoff: float = 8.0, hedge_after: Optional[float] = None,
+				 breaker: Optional[CircuitBreaker] = None, pool_size: int = 16, max_call_s: Optional[float] = None):
+		self.name = name
+		self.base_url = base_url
+		self.timeout = timeout
+		self.max_retries = max_retries
+		self.backoff = backoff
+		self.max_backoff = max_backoff
+		self.hedge_after = hedge_after
+		# Wall-clock cap for one `get_json`, retries and backoff included
+		self.max_call_s = timeout + max_backoff if max_call_s is None else max_call_s
+		self.breaker = breaker or CircuitBreaker()
+		self.session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+		self.session.mount("https://", adapter)
+		self.session.mount("http://", adapter)
+		self._hedge_pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f"{name}-hedge") if hedge_after else None
+		self._stats_lock = threading.Lock()
+		self._stats: Dict[str, float] = {
+			"requests": 0, "successes": 0, "failures": 0, "retries": 0,
+			"hedges": 0, "short_circuited": 0, "latency_ms_total": 0.0,
+		}
+		self.last_error: Optional[str] = None
+
+	def _count(self, key: str, amount: float = 1) -> None:
+		with self._stats_lock:
+			self._stats[key] += amount
+
+	def stats(self) -> Dict[str, object]:
+		with self._stats_lock:
+			stats: Dict[str, object] = dict(self._stats)
+		ok = stats["successes"] or 0
+		stats["mean_latency_ms"] = round(stats.pop("latency_ms_total") / ok, 1) if ok else None
+		stats.update({
+			"provider": self.name,
+			"circuit": self.breaker.state,
+			"consecutive_failures": self.breaker.failures,
+			"last_error": self.last_error,
+		})
+		return stats
+
+	def _send(self, params: Dict[str, object]) -> requests.Response:
+		if self._hedge_pool is None:
+			return self.session.get(self.base_url, params=params, timeout=self.timeout)
+		primary = self._hedge_pool.submit(self.session.get, self.base_url, params=params, timeout=self.timeout)
+		done, _ = wait([primary], timeout=self.hedge_after)
+		if done:
+			return primary.result()
+		self._count("hedges")
+		hedge = self._hedge_pool.submit(self.session.get, self.base_url, params=params, timeout=self.timeout)
+		pending = {primary, hedge}
+		error: Optional[BaseException] = None
+		while pending:
+			done, pending = wait(pending, return_when=FIRST_COMPLETED)
+			for fut in done:
+				if fut.exception() is None:
+					return fut.result()
+				error = fut.exception()
+		raise error  # both attempts failed
+
+	def get_json(self, params: Dict[str, object]) -> Dict[str, object]:
+		"""GET `params` against the provider and return the decoded JSON body."""
+		with span(f"provider.{self.name}"):
+			return self._get_json(params)
+
+	def _get_json(self, params: Dict[str, object]) -> Dict[str, object]:
+		if not self.breaker.allow():
+			self._count("short_circuited")
+			raise ProviderUnavailable(f"{self.name} circuit open")
+		attempt = 0
+		call_start = time.perf_counter()
+		while True:
+			self._count("requests")
+			start = time.perf_counter()
+			delay: Optional[float] = None
+			try:
+				resp = self._send(params)
+				if resp.status_code in RETRY_STATUSES:
+					delay = _retry_after_seconds(resp)
+				resp.raise_for_status()
+				data = _json_loads(resp.content) if resp.content else {}
+				data = data or {}
+			except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+				provider_down = not isinstance(e, requests.HTTPError) or e.response is None or e.response.status_code in RETRY_STATUSES
+				if not provider_down:
+					# A plain 4xx means the provider is up; don't trip the breaker
+					self._count("failures")
+					self.last_error = f"{type(e).__name__}: {e}"
+					self.breaker.record_success()
+					raise
+				self.breaker.record_failure()
+				if delay is None:
+					delay = min(self.backoff * (2 ** attempt) * (1 + random.random()), self.max_backoff)
+				# A hung provider has already cost a full timeout, so timeouts are not
+				# retried; nor is anything once the circuit opened, Retry-After exceeds
+				# max_backoff, or the retry would overrun the per-call cap.
+				retry = (
+					not isinstance(e, requests.Timeout)
+					and attempt < self.max_retries
+					and delay <= self.max_backoff
+					and self.breaker.state == "closed"
+					and time.perf_counter() - call_start + delay < self.max_call_s
+				)
+				if retry:
+					attempt += 1
+					self._count("retries")
+					time.sleep(delay)
+					continue
+				self._count("failures")
+				self.last_error = f"{type(e).__name__}: {e}"
+				raise
+			except Exception as e:
+				self._count("failures")
+				self.last_error = f"{type(e).__name__}: {e}"
+				self.breaker.record_failure()
+				raise
+			self._count("successes")
+			self._count("latency_ms_total", (time.perf_counter() - start) * 1000.0)
+			self.breaker.record_success()
+			return data
@@ -1,6 +1,29 @@
 import re
 import numpy as np
 
+from src.document import Document
+
+# Patterns are matched against the document's lowercased view, so no IGNORECASE needed
+DATA_AVAILABILITY_RE = re.compile("|".join([
+    r"data availability statement", r"data are available", r"data can be found",
+    r"dataset is available", r"data can be accessed", r"supporting data",
+    r"data set", r"dataset", r"data repository", r"supplementary materials",
+    r"data sharing", r"data access", r"data availability"
+]))
+CODE_AVAILABILITY_RE = re.compile("|".join([
+    r"code availability", r"code is available", r"scripts are available",
+    r"analysis code", r"repository", r"github.com", r"gitlab.com",
+    r"source code", r"implementation", r"algorithm", r"pseudocode",
+    r"code repository", r"software", r"program"
+]))
+METHODOLOGY_STRENGTH_RES = [
+    re.compile(r"control group|controlled experiment"),
+    re.compile(r"randomized|randomly assigned"),
+    re.compile(r"double-blind|single-blind|blinded study"),
+]
+# Extracts numbers following patterns like 'n = ', 'N = ', 'sample of', etc.
+SAMPLE_SIZE_RE = re.compile(r"(?:sample size of|sample of|n\s*=\s*)(\d+)")
+
 class QualityAssessor:
     def __init__(self):
         self.weights = {
@@ -14,41 +37,23 @@ class QualityAssessor:
 
     def check_data_availability(self, text):
         """Checks for a data availability statement with more robust patterns."""
-        patterns = [
-            r"data availability statement", r"data are available", r"data can be found",
-            r"dataset is available", r"data can be accessed", r"supporting data",
-            r"data set", r"dataset", r"data repository", r"supplementary materials",
-            r"data sharing", r"data access", r"data availability"
-        ]
-        return any(re.search(p, text, re.IGNORECASE) for p in patterns)
+        return bool(DATA_AVAILABILITY_RE.search(Document.ensure(text).lower))
 
     def check_code_availability(self, text):
         """Checks for a code availability statement with more robust patterns."""
-        patterns = [
-            r"code availability", r"code is available", r"scripts are available",
-            r"analysis code", r"repository", r"github.com", r"gitlab.com",
-            r"source code", r"implementation", r"algorithm", r"pseudocode",
-            r"code repository", r"software", r"program"
-        ]
-        return any(re.search(p, text, re.IGNORECASE) for p in patterns)
+        return bool(CODE_AVAILABILITY_RE.search(Document.ensure(text).lower))
 
     def assess_methodology_strength(self, text):
         """Assess the strength of the methodology based on keywords."""
-        strength_score = 0
-        if any(re.search(p, text, re.IGNORECASE) for p in [r"control group", r"controlled experiment"]):
-            strength_score += 1
-        if any(re.search(p, text, re.IGNORECASE) for p in [r"randomized", r"randomly assigned"]):
-            strength_score += 1
-        if any(re.search(p, text, re.IGNORECASE) for p in [r"double-blind", r"single-blind", r"blinded study"]):
-            strength_score += 1
+        lower = Document.ensure(text).lower
+        strength_score = sum(1 for pattern in METHODOLOGY_STRENGTH_RES if pattern.search(lower))
         return strength_score / 3.0 # Normalize score
 
     # --- Week 6: Methodology Validation ---
 
     def assess_sample_size(self, text):
         """Extracts sample size and provides a basic assessment with a more robust regex."""
-        # Extracts numbers following patterns like 'n = ', 'N = ', 'sample of', etc.
-        matches = re.findall(r"(?:sample size of|sample of|n\s*=\s*|N\s*=\s*)(\d+)", text, re.IGNORECASE)
+        matches = SAMPLE_SIZE_RE.findall(Document.ensure(text).lower)
         if not matches:
             return 0, None # Return 0 score and no sample size found
         
@@ -61,7 +66,12 @@ class QualityAssessor:
     # --- Week 6: Quality Score Integration ---
 
     def calculate_unified_quality_score(self, text):
-        """Combines multiple quality metrics into a single score."""
+        """Combines multiple quality metrics into a single score.
+
+        Accepts a raw string or a parsed `Document`; the text is parsed once and
+        shared by every check.
+        """
+        text = Document.ensure(text)
         scores = {
             'data_availability': 1.0 if self.check_data_availability(text) else 0.0,
             'code_availability': 1.0 if self.check_code_availability(text) else 0.0,
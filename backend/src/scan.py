@@ -0,0 +1,271 @@
+import os
+import sys
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.document import Document
+from src.full_analysis import bias_stage, quality_stage, statistics_stage
+from src.pdf_extraction import extract_pdf_text
+
+try:
+	import pyarrow as pa
+	import pyarrow.parquet as pq
+except ImportError:  # optional; JSONL output needs nothing extra
+	pa = pq = None
+
+# One work unit: (document id, file path or None, inline text or None)
+WorkUnit = Tuple[str, Optional[str], Optional[str]]
+
+CORPUS_SUFFIXES = (".txt", ".pdf")
+METHODOLOGY_CHECKS = ("mentions_control_group", "mentions_randomization", "mentions_blinding")
+QUALITY_CRITERIA = ("data_availability", "code_availability", "methodology_strength", "sample_size")
+
+
+def iter_work_units(source: str, id_field: str = "id", text_field: str = "text") -> Iterator[WorkUnit]:
+	"""Documents of a corpus: a directory of .txt/.pdf files or a JSONL file.
+
+	Files are read by the worker that scans them, so only paths cross the process
+	boundary; JSONL documents carry their text inline.
+	"""
+	if os.path.isdir(source):
+		for root, _, files in os.walk(source):
+			for name in sorted(files):
+				if name.lower().endswith(CORPUS_SUFFIXES):
+					path = os.path.join(root, name)
+					yield os.path.relpath(path, source), path, None
+		return
+	with open(source, "r", encoding="utf-8") as f:
+		for line_no, line in enumerate(f, 1):
+			if not line.strip():
+				continue
+			record = json.loads(line)
+			yield str(record.get(id_field, line_no)), None, record.get(text_field) or ""
+
+
+def _read_unit(path: Optional[str], text: Optional[str]) -> Tuple[str, Optional[int]]:
+	if path is None:
+		return text or "", None
+	if path.lower().endswith(".pdf"):
+		text, info = extract_pdf_text(path)
+		return text, info["pages"]
+	with open(path, "r", encoding="utf-8", errors="ignore") as f:
+		return f.read(), None
+
+
+def scan_document(doc_id: str, path: Optional[str] = None, text: Optional[str] = None) -> Dict[str, object]:
+	"""Bias, statistics and quality signals for one document as a flat record."""
+	start = time.perf_counter()
+	record: Dict[str, object] = {"id": doc_id, "chars": 0, "pages": None, "error": None}
+	try:
+		text, record["pages"] = _read_unit(path, text)
+		record["chars"] = len(text)
+		if not text.strip():
+			raise ValueError("no text extracted")
+		doc = Document(text)
+		stats = statistics_stage(doc)
+		quality = quality_stage(doc)
+		record["detected_biases"] = bias_stage(doc)["detected_biases"]
+		record["p_values"] = stats["p_values"]
+		record["p_hacking_suspected"] = stats["p_hacking_suspected"]
+		for check in METHODOLOGY_CHECKS:
+			record[check] = stats["methodology_checks"].get(check)
+		record["quality_score"] = quality["score"]
+		for criterion in QUALITY_CRITERIA:
+			record[f"quality_{criterion}"] = quality["scores"].get(criterion)
+	except Exception as e:
+		record["error"] = f"{type(e).__name__}: {e}"
+	record["elapsed_ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+	return record
+
+
+def scan_chunk(units: List[WorkUnit]) -> List[Dict[str, object]]:
+	"""Worker entry point: scan a chunk of documents (analyzers are reused per process)."""
+	return [scan_document(*unit) for unit in units]
+
+
+class JsonlSink:
+	"""Appends one JSON record per line; the file itself is the resume checkpoint."""
+
+	def __init__(self, path: str):
+		self.path = path
+
+	def completed_ids(self) -> Set[str]:
+		if not os.path.exists(self.path):
+			return set()
+		done: Set[str] = set()
+		good_bytes = 0
+		with open(self.path, "rb") as f:
+			for line in f:
+				try:
+					done.add(json.loads(line)["id"])
+				except (ValueError, KeyError):
+					break  # a record cut short by an interrupted write; drop it and the rest
+				good_bytes += len(line)
+		with open(self.path, "r+b") as f:
+			f.truncate(good_bytes)
+		return done
+
+	def __enter__(self) -> "JsonlSink":
+		self._f = open(self.path, "a", encoding="utf-8")
+		return self
+
+	def write(self, records: List[Dict[str, object]]) -> None:
+		self._f.write("".join(json.dumps(r) + "\n" for r in records))
+		self._f.flush()
+
+	def __exit__(self, *exc) -> None:
+		self._f.close()
+
+
+class ParquetSink:
+	"""Writes row groups as numbered part files in an output directory.
+
+	Each flush is a complete `part-NNNNN.parquet` file, so an interrupted scan
+	loses at most the rows still buffered and resumes from the ids in the parts.
+	"""
+
+	def __init__(self, path: str, rows_per_part: int = 1000):
+		if pa is None:
+			raise RuntimeError("Parquet output requires pyarrow; install it or write .jsonl instead")
+		self.path = path
+		self.rows_per_part = rows_per_part
+		self._rows: List[Dict[str, object]] = []
+		self.schema = pa.schema(
+			[
+				("id", pa.string()),
+				("chars", pa.int64()),
+				("pages", pa.int64()),
+				("error", pa.string()),
+				("detected_biases", pa.list_(pa.string())),
+				("p_values", pa.list_(pa.float64())),
+				("p_hacking_suspected", pa.bool_()),
+				*[(check, pa.bool_()) for check in METHODOLOGY_CHECKS],
+				("quality_score", pa.float64()),
+				*[(f"quality_{c}", pa.float64()) for c in QUALITY_CRITERIA],
+				("elapsed_ms", pa.float64()),
+			]
+		)
+
+	def _parts(self) -> List[str]:
+		if not os.path.isdir(self.path):
+			return []
+		return sorted(n for n in os.listdir(self.path) if n.startswith("part-") and n.endswith(".parquet"))
+
+	def completed_ids(self) -> Set[str]:
+		done: Set[str] = set()
+		for name in self._parts():
+			done.update(pq.read_table(os.path.join(self.path, name), columns=["id"]).column("id").to_pylist())
+		return done
+
+	def __enter__(self) -> "ParquetSink":
+		os.makedirs(self.path, exist_ok=True)
+		self._next_part = len(self._parts())
+		return self
+
+	def write(self, records: List[Dict[str, object]]) -> None:
+		self._rows.extend(records)
+		if len(self._rows) >= self.rows_per_part:
+			self._flush()
+
+	def _flush(self) -> None:
+		if not self._rows:
+			return
+		table = pa.Table.from_pylist(self._rows, schema=self.schema)
+		final = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+		pq.write_table(table, final + ".tmp")
+		os.replace(final + ".tmp", final)  # parts appear atomically
+		self._next_part += 1
+		self._rows = []
+
+	def __exit__(self, *exc) -> None:
+		self._flush()
+
+
+def open_sink(output: str, fmt: Optional[str] = None):
+	fmt = fmt or ("jsonl" if output.endswith((".jsonl", ".json")) else "parquet")
+	return JsonlSink(output) if fmt == "jsonl" else ParquetSink(output)
+
+
+def _chunks(units: Iterator[WorkUnit], size: int) -> Iterator[List[WorkUnit]]:
+	chunk: List[WorkUnit] = []
+	for unit in units:
+		chunk.append(unit)
+		if len(chunk) >= size:
+			yield chunk
+			chunk = []
+	if chunk:
+		yield chunk
+
+
+def scan_corpus(source: str, output: str, fmt: Optional[str] = None, workers: Optional[int] = None,
+				chunk_size: int = 16, id_field: str = "id", text_field: str = "text",
+				progress_every_s: float = 10.0) -> Dict[str, object]:
+	"""Scan every document of `source` not already in `output` and stream records to it.
+
+	Documents are grouped into chunks of `chunk_size` and spread over a process
+	pool, with at most two chunks per worker in flight so memory stays flat on
+	large corpora. `workers=0` scans in this process.
+	"""
+	workers = (os.cpu_count() or 1) if workers is None else workers
+	sink = open_sink(output, fmt)
+	done = sink.completed_ids()
+	units = (u for u in iter_work_units(source, id_field, text_field) if u[0] not in done)
+	scanned = errors = 0
+	start = last_report = time.perf_counter()
+
+	def report(records: List[Dict[str, object]]) -> None:
+		nonlocal scanned, errors, last_report
+		sink.write(records)
+		scanned += len(records)
+		errors += sum(1 for r in records if r["error"])
+		now = time.perf_counter()
+		if progress_every_s and now - last_report >= progress_every_s:
+			print(f"{scanned} docs scanned, {scanned / (now - start):.1f} docs/s", file=sys.stderr)
+			last_report = now
+
+	with sink:
+		if workers <= 0:
+			for chunk in _chunks(units, chunk_size):
+				report(scan_chunk(chunk))
+		else:
+			with ProcessPoolExecutor(max_workers=workers) as pool:
+				pending: Set[Future] = set()
+				for chunk in _chunks(units, chunk_size):
+					if len(pending) >= 2 * workers:
+						finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+						for fut in finished:
+							report(fut.result())
+					pending.add(pool.submit(scan_chunk, chunk))
+				for fut in wait(pending).done:
+					report(fut.result())
+
+	elapsed = time.perf_counter() - start
+	return {
+		"scanned": scanned,
+		"skipped": len(done),
+		"errors": errors,
+		"seconds": round(elapsed, 3),
+		"docs_per_sec": round(scanned / elapsed, 2) if elapsed > 0 else 0.0,
+	}
+
+
+if __name__ == "__main__":
+	import argparse
+
+	parser = argparse.ArgumentParser(description="Scan a corpus for bias, statistics and quality signals.")
+	parser.add_argument("source", help="Directory of .txt/.pdf files, or a JSONL corpus")
+	parser.add_argument("output", help="Output .jsonl file, or a directory of Parquet parts")
+	parser.add_argument("--format", choices=["jsonl", "parquet"], default=None, help="Default: from the output name")
+	parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 = in-process; default: all cores)")
+	parser.add_argument("--chunk-size", type=int, default=16, help="Documents per work unit")
+	parser.add_argument("--id-field", default="id", help="JSONL field holding the document id")
+	parser.add_argument("--text-field", default="text", help="JSONL field holding the document text")
+	args = parser.parse_args()
+
+	summary = scan_corpus(args.source, args.output, args.format, args.workers, args.chunk_size, args.id_field, args.text_field)
+	print(
+		f"Scanned {summary['scanned']} documents ({summary['skipped']} already done, {summary['errors']} errors) "
+		f"in {summary['seconds']} s: {summary['docs_per_sec']} docs/s -> {args.output}"
+	)
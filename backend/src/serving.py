@@ -0,0 +1,95 @@
+import gc
+import logging
+import os
+import signal
+import threading
+from typing import Dict
+
+from src import full_analysis, plagiarism_checker
+from src.advanced_bias_analyzer import AdvancedBiasAnalyzer, StatisticalAnalyzer
+from src.model_store import get_model_store
+from src.quality_assessor import QualityAssessor
+
+# Set by gunicorn.conf.py so the app loads shared state once, in the master
+PRELOAD_SHARED_STATE = os.environ.get("PRELOAD_SHARED_STATE", "") == "1"
+# Comma-separated model-store artifacts to load before forking (e.g. "tfidf_lr,bias_detector")
+PRELOAD_MODELS = [m.strip() for m in os.environ.get("PRELOAD_MODELS", "").split(",") if m.strip()]
+# A worker whose resident memory grows past this exits gracefully and is replaced (0 disables)
+MAX_WORKER_RSS_MB = float(os.environ.get("MAX_WORKER_RSS_MB", "0"))
+# RSS is sampled every this many requests
+RSS_CHECK_EVERY = int(os.environ.get("RSS_CHECK_EVERY", "50"))
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_requests = 0
+_recycling = False
+_lock = threading.Lock()
+
+
+def preload_shared_state() -> Dict[str, object]:
+	"""Load read-only models and indexes before workers are forked.
+
+	Everything created here is inherited copy-on-write by each worker instead of
+	being rebuilt per process. `gc.freeze()` moves these objects out of the
+	collector's generations so later collections in the workers do not touch
+	(and thereby copy) their pages.
+	"""
+	idf_model = plagiarism_checker.get_idf_model()
+	index = plagiarism_checker.get_fingerprint_index()
+	full_analysis._analyzer("bias", AdvancedBiasAnalyzer)
+	full_analysis._analyzer("statistics", StatisticalAnalyzer)
+	full_analysis._analyzer("quality", QualityAssessor)
+	for name in PRELOAD_MODELS:
+		get_model_store().load(name)
+	gc.collect()
+	gc.freeze()
+	return {
+		"idf_terms": len(idf_model.vocabulary) if idf_model is not None else 0,
+		"fingerprint_documents": len(index),
+		"models": PRELOAD_MODELS,
+		"frozen_objects": gc.get_freeze_count(),
+	}
+
+
+def worker_rss_mb() -> float:
+	"""Resident set size of this process in MiB (Linux only; 0 elsewhere)."""
+	try:
+		with open("/proc/self/statm", "r") as f:
+			return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+	except (OSError, IndexError, ValueError):
+		return 0.0
+
+
+def under_gunicorn() -> bool:
+	"""True inside a gunicorn worker, whose master replaces workers that exit."""
+	return "gunicorn" in os.environ.get("SERVER_SOFTWARE", "")
+
+
+def check_worker_recycle() -> bool:
+	"""Count a request and ask the server to replace this worker once RSS is too high.
+
+	SIGTERM makes the gunicorn worker finish its in-flight requests and exit; the
+	master then forks a fresh one from the preloaded state. Any other server
+	(e.g. plain uvicorn) would just shut down, so there the limit is only logged.
+	Returns True when recycling was requested.
+	"""
+	global _requests, _recycling
+	if MAX_WORKER_RSS_MB <= 0:
+		return False
+	with _lock:
+		_requests += 1
+		if _recycling or _requests % RSS_CHECK_EVERY:
+			return False
+		rss = worker_rss_mb()
+		if rss <= MAX_WORKER_RSS_MB:
+			return False
+		_recycling = True
+	if not under_gunicorn():
+		logger.warning(
+			"Worker RSS %.0f MiB exceeds MAX_WORKER_RSS_MB=%.0f but the server is not gunicorn; not recycling",
+			rss, MAX_WORKER_RSS_MB,
+		)
+		return False
+	os.kill(os.getpid(), signal.SIGTERM)
+	return True
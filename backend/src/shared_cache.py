@@ -0,0 +1,74 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Optional
+
+from src.instrumentation import cache_event
+
+
+class SqliteStore:
+	"""Local SQLite file (WAL mode) shared by every worker process.
+
+	WAL lets many readers proceed while one worker writes. Connections are
+	opened lazily per thread and per process, so a store created before a fork
+	is safe to use in the children.
+	"""
+
+	schema = ""
+
+	def __init__(self, path: str):
+		self.path = path
+		self._local = threading.local()
+
+	def _conn(self) -> sqlite3.Connection:
+		conn = getattr(self._local, "conn", None)
+		if conn is None or getattr(self._local, "pid", None) != os.getpid():
+			conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			conn.execute(self.schema)
+			self._local.conn = conn
+			self._local.pid = os.getpid()
+		return conn
+
+
+class SharedCache(SqliteStore):
+	"""Small key/value cache shared by every worker process; values are JSON with an expiry time."""
+
+	schema = "CREATE TABLE IF NOT EXISTS cache (name TEXT, key TEXT, value TEXT, expires REAL, PRIMARY KEY (name, key))"
+
+	def __init__(self, path: str, name: str, ttl: float = 86400.0):
+		super().__init__(path)
+		self.name = name
+		self.ttl = ttl
+
+	@staticmethod
+	def make_key(*parts: Any) -> str:
+		return hashlib.sha1(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+	def get(self, key: str) -> Optional[Any]:
+		try:
+			row = self._conn().execute(
+				"SELECT value FROM cache WHERE name = ? AND key = ? AND expires > ?", (self.name, key, time.time())
+			).fetchone()
+		except sqlite3.Error:
+			row = None
+		cache_event(self.name, row is not None)
+		return json.loads(row[0]) if row else None
+
+	def set(self, key: str, value: Any) -> None:
+		try:
+			self._conn().execute(
+				"INSERT OR REPLACE INTO cache (name, key, value, expires) VALUES (?, ?, ?, ?)",
+				(self.name, key, json.dumps(value), time.time() + self.ttl),
+			)
+		except sqlite3.Error:
+			pass  # a busy or read-only cache must never fail a request
+
+	def prune(self) -> int:
+		"""Delete expired entries; returns how many were removed."""
+		cur = self._conn().execute("DELETE FROM cache WHERE name = ? AND expires <= ?", (self.name, time.time()))
+		return cur.rowcount
@@ -2,19 +2,20 @@ import spacy
 from transformers import DistilBertTokenizer
 import re
 
+from src.document import Document
+
 class TextPreprocessor:
     def __init__(self):
         self.nlp = spacy.load("en_core_web_sm")
         self.tokenizer = DistilBertTokenizer.from_pretrained('distilbert-base-uncased')
     
     def preprocess_paper(self, text):
-        # Clean and tokenize academic text
-        doc = self.nlp(text)
-        sentences = [sent.text for sent in doc.sents]
-        return sentences
+        # Clean and tokenize academic text; the spaCy parse is cached on the Document
+        document = Document.ensure(text)
+        return document.view("spacy_sentences", lambda d: [sent.text for sent in self.nlp(d.raw).sents])
     
     def extract_citations(self, text):
         # Extract citation patterns using regex
         citation_pattern = r'\[(\d+(?:,\s*\d+)*)\]'
-        citations = re.findall(citation_pattern, text)
+        citations = re.findall(citation_pattern, Document.ensure(text).raw)
         return citations
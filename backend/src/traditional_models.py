@@ -5,10 +5,14 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from src.model_store import get_model_store
+
+TFIDF_MODEL_NAME = 'tfidf_lr'
+
 class TraditionalModels:
 
-    def train_tfidf_model(self, df):
-        """Trains a TF-IDF and Logistic Regression model."""
+    def train_tfidf_model(self, df, store=None):
+        """Trains a TF-IDF and Logistic Regression model, saving a new version to `store` if given."""
         print("\n--- Training TF-IDF Model ---")
         # Map bias types to a single binary label: 0 for No Bias, 1 for Bias
         df['binary_label'] = df['label'].apply(lambda x: 0 if x == 0 else 1)
@@ -28,8 +32,18 @@ class TraditionalModels:
         accuracy = accuracy_score(y_test, y_pred)
         
         print(f"TF-IDF Model Accuracy: {accuracy:.4f}")
+        if store is not None:
+            version = store.save_sklearn(
+                TFIDF_MODEL_NAME, {'model': model, 'vectorizer': vectorizer}, {'accuracy': float(accuracy)}
+            )
+            print(f"Saved {TFIDF_MODEL_NAME} version {version} to {store.root}")
         return model, vectorizer
 
+    def load_tfidf_model(self, store=None, version=None):
+        """Loads a saved (model, vectorizer) pair; shared with every other caller in the process."""
+        artifact = (store or get_model_store()).load(TFIDF_MODEL_NAME, version)
+        return artifact['model'], artifact['vectorizer']
+
     def rule_based_detector(self, sentence):
         """A simple rule-based detector for identifying potential funding bias."""
         funding_keywords = ['funded by', 'sponsored by', 'financial support from', 'grant from']
@@ -39,32 +53,44 @@ class TraditionalModels:
         return "No Bias"
 
 class EnsembleModel:
-    def __init__(self, dl_model, tfidf_model, rule_based_detector):
+    def __init__(self, dl_model, tfidf_model, rule_based_detector, vectorizer=None):
         self.dl_model = dl_model
         self.tfidf_model = tfidf_model
+        self.vectorizer = vectorizer
         self.rule_based_detector = rule_based_detector
 
     def predict(self, sentence):
-        """Placeholder for an ensemble prediction method."""
-        # In a real implementation, you would get predictions from each model
-        # and combine them using a voting or weighting scheme.
+        """Majority vote of the available models ("Bias" vs "No Bias"); ties go to the rule-based detector."""
         print(f"\n--- Ensemble Prediction for: '{sentence}' ---")
-        
-        # 1. Deep Learning Model Prediction (requires trained model)
-        # dl_prediction = self.dl_model.predict(sentence)
-        print("DL Model Prediction: (placeholder)")
+        votes = []
+
+        # 1. Deep Learning Model Prediction (a trained BiasDetector)
+        if self.dl_model is not None:
+            dl_prediction = self.dl_model.predict(sentence)
+            print(f"DL Model Prediction: {dl_prediction}")
+            votes.append(dl_prediction != "No Bias")
+        else:
+            print("DL Model Prediction: (no model loaded)")
 
-        # 2. TF-IDF Model Prediction (requires trained model)
-        # tfidf_prediction = self.tfidf_model.predict(vectorizer.transform([sentence]))
-        print("TF-IDF Model Prediction: (placeholder)")
+        # 2. TF-IDF Model Prediction (binary: 1 = bias)
+        if self.tfidf_model is not None and self.vectorizer is not None:
+            tfidf_prediction = int(self.tfidf_model.predict(self.vectorizer.transform([sentence]))[0])
+            print(f"TF-IDF Model Prediction: {'Bias' if tfidf_prediction else 'No Bias'}")
+            votes.append(bool(tfidf_prediction))
+        else:
+            print("TF-IDF Model Prediction: (no model loaded)")
 
         # 3. Rule-based prediction
         rule_prediction = self.rule_based_detector(sentence)
         print(f"Rule-Based Prediction: {rule_prediction}")
+        votes.append(rule_prediction != "No Bias")
 
-        # Combine results (e.g., simple majority vote)
-        final_prediction = rule_prediction # Placeholder logic
-        return final_prediction
+        biased = sum(votes)
+        if biased * 2 == len(votes):
+            return rule_prediction
+        if biased * 2 > len(votes):
+            return rule_prediction if rule_prediction != "No Bias" else "Bias"
+        return "No Bias"
 
 if __name__ == '__main__':
     print("Traditional Models script created.")
@@ -79,7 +105,7 @@ if __name__ == '__main__':
     # Demonstrate training the TF-IDF model
     # Note: This will fail with the tiny sample file, as splitting it leaves no data for training or testing.
     if len(df) > 1:
-        # models.train_tfidf_model(df.copy()) # copy to avoid changing original df
+        # models.train_tfidf_model(df.copy(), store=get_model_store()) # copy to avoid changing original df
         pass
 
     # Demonstrate the rule-based detector
@@ -89,6 +115,10 @@ if __name__ == '__main__':
     print(f"'{test_sentence_1}' -> {models.rule_based_detector(test_sentence_1)}")
     print(f"'{test_sentence_2}' -> {models.rule_based_detector(test_sentence_2)}")
 
-    # Demonstrate the ensemble placeholder
-    ensemble = EnsembleModel(dl_model=None, tfidf_model=None, rule_based_detector=models.rule_based_detector)
+    # Demonstrate the ensemble with whatever has been trained and saved
+    store = get_model_store()
+    tfidf_model, vectorizer = models.load_tfidf_model(store) if store.latest_version(TFIDF_MODEL_NAME) else (None, None)
+    ensemble = EnsembleModel(
+        dl_model=None, tfidf_model=tfidf_model, rule_based_detector=models.rule_based_detector, vectorizer=vectorizer
+    )
     ensemble.predict(test_sentence_1)
@@ -0,0 +1,122 @@
+"""Local stand-in for the Semantic Scholar and OpenAlex search APIs.
+
+Serves `/graph/v1/paper/search` (Semantic Scholar shape) and `/works`
+(OpenAlex shape, with an inverted-index abstract) from a fixed synthetic
+corpus, with configurable latency so end-to-end runs are repeatable offline.
+
+    python -m benchmarks.mock_scholar --port 8765 --latency-ms 80
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _inverted_index(text: str) -> Dict[str, List[int]]:
+    index: Dict[str, List[int]] = {}
+    for pos, word in enumerate(text.split()):
+        index.setdefault(word, []).append(pos)
+    return index
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+    def do_GET(self):
+        server: "MockScholarServer" = self.server  # type: ignore[assignment]
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        server.requests += 1
+        delay = server.latency + (random.random() * server.jitter if server.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if server.error_rate and random.random() < server.error_rate:
+            return self._reply(503, {"error": "injected failure"})
+
+        query = params.get("query") or params.get("search") or ""
+        limit = int(params.get("limit") or params.get("per_page") or 10)
+        papers = server.pick(query, limit)
+        if url.path.endswith("/paper/search"):
+            body = {"total": len(papers), "data": [
+                {"paperId": p["id"], "title": p["title"], "url": f"https://example.org/{p['id']}", "abstract": p["abstract"]}
+                for p in papers
+            ]}
+        elif url.path.endswith("/works"):
+            body = {"meta": {"count": len(papers)}, "results": [
+                {"id": f"https://openalex.org/{p['id']}", "title": p["title"], "abstract_inverted_index": _inverted_index(p["abstract"])}
+                for p in papers
+            ]}
+        else:
+            return self._reply(404, {"error": "not found"})
+        self._reply(200, body)
+
+    def _reply(self, status: int, body: Dict[str, object]):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockScholarServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, corpus: List[Dict[str, str]], host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0):
+        super().__init__((host, port), _Handler)
+        self.corpus = corpus
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.requests = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pick(self, query: str, limit: int) -> List[Dict[str, str]]:
+        """Deterministic per-query slice of the corpus."""
+        if not self.corpus:
+            return []
+        start = sum(map(ord, query)) % len(self.corpus)
+        return [self.corpus[(start + i) % len(self.corpus)] for i in range(min(limit, len(self.corpus)))]
+
+    def start(self) -> "MockScholarServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from benchmarks.synthetic import make_paper, make_related_papers
+
+    parser = argparse.ArgumentParser(description="Run a mock Semantic Scholar/OpenAlex API.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--corpus-size", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = make_related_papers(make_paper(10), args.corpus_size)
+    server = MockScholarServer(corpus, port=args.port, latency_ms=args.latency_ms,
+                               jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    print(f"Mock scholarly API on {server.base_url}")
+    print(f"  SEMANTIC_SCHOLAR_SEARCH_URL={server.base_url}/graph/v1/paper/search")
+    print(f"  OPENALEX_SEARCH_URL={server.base_url}/works")
+    server.serve_forever()
@@ -0,0 +1,79 @@
+"""Compare PDF text backends: pages/sec and agreement with pdfplumber.
+
+Runs every available backend (plus the pdfium-with-fallback pipeline) over a
+directory of PDFs, or over synthetic PDFs when no corpus is given.
+
+    python -m benchmarks.pdf_backends --corpus /path/to/pdfs
+    python -m benchmarks.pdf_backends --pages 5,50,200
+"""
+import argparse
+import difflib
+import glob
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from benchmarks.synthetic import make_paper, make_pdf
+from src.pdf_extraction import BACKENDS, extract_pdf_text, pdfium
+
+
+def load_corpus(corpus: str, pages: List[int]) -> List[Tuple[str, bytes]]:
+    if corpus:
+        docs = []
+        for path in sorted(glob.glob(os.path.join(corpus, "**", "*.pdf"), recursive=True)):
+            with open(path, "rb") as f:
+                docs.append((os.path.relpath(path, corpus), f.read()))
+        return docs
+    return [(f"synthetic-{n}p", make_pdf(make_paper(n, seed=n))) for n in pages]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default="", help="Directory of PDFs (searched recursively)")
+    parser.add_argument("--pages", default="5,50", help="Synthetic sizes when no corpus is given")
+    parser.add_argument("--max-pages", type=int, default=10_000)
+    args = parser.parse_args()
+
+    docs = load_corpus(args.corpus, [int(p) for p in args.pages.split(",") if p.strip()])
+    if not docs:
+        print("No PDFs found.")
+        return 1
+    backends = [name for name in BACKENDS if name != "pdfium" or pdfium is not None]
+    if pdfium is None:
+        print("pypdfium2 not installed; only pdfplumber is measured.")
+
+    totals: Dict[str, List[float]] = {name: [0.0, 0.0] for name in backends}  # seconds, pages
+    fallback_pages = 0
+    mismatched = 0
+    for name, data in docs:
+        texts: Dict[str, str] = {}
+        for backend in backends:
+            start = time.perf_counter()
+            text, info = extract_pdf_text(data, max_pages=args.max_pages, max_chars=10 ** 9, backend=backend)
+            elapsed = time.perf_counter() - start
+            totals[backend][0] += elapsed
+            totals[backend][1] += info["pages_read"]
+            texts[backend] = text
+            if backend != "pdfplumber":
+                fallback_pages += info["fallback_pages"]
+            print(f"{name:<40} {backend:<11} {info['pages_read']:5d} pages {elapsed:8.3f} s  {info['pages_read'] / elapsed:8.1f} pages/s")
+        for backend in backends:
+            if backend != "pdfplumber" and texts[backend] != texts["pdfplumber"]:
+                mismatched += 1
+                ratio = difflib.SequenceMatcher(None, texts["pdfplumber"], texts[backend], autojunk=False).quick_ratio()
+                print(f"{'':<40} {backend} text differs from pdfplumber (similarity {ratio:.3f})")
+
+    print("\nTotal throughput:")
+    for backend, (seconds, pages) in totals.items():
+        print(f"  {backend:<11} {pages / seconds if seconds else 0.0:8.1f} pages/s over {int(pages)} pages")
+    if "pdfium" in totals:
+        print(f"  pages re-extracted with pdfplumber: {fallback_pages}; documents with differing text: {mismatched}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Benchmark the analysis pipeline on synthetic papers.
+
+Times PDF extraction, sectioning, similarity scoring, the bias/statistics/quality
+analyzers, citation metrics and end-to-end `/analyze` + `/analyze/full` requests
+against a local mock scholarly API. Results are written to
+`benchmarks/results/<commit>.json`; pass `--compare` with an earlier results file
+(or commit id) to flag regressions.
+
+    python -m benchmarks.run --pages 2,10,50 --latency-ms 50
+    python -m benchmarks.run --compare 1a2b3c4
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from benchmarks.mock_scholar import MockScholarServer
+from benchmarks.synthetic import make_paper, make_pdf, make_related_papers
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def commit_id() -> str:
+    sha = _git("rev-parse", "--short", "HEAD") or "unknown"
+    return f"{sha}-dirty" if _git("status", "--porcelain", "--untracked-files=no") else sha
+
+
+def bench(results: Dict[str, Dict[str, float]], name: str, fn: Callable[[], object], repeat: int, **extra: float) -> None:
+    """Run `fn` once to warm up, then `repeat` timed runs."""
+    fn()
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    results[name] = {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "mean_s": statistics.fmean(times),
+        "runs": repeat,
+        **extra,
+    }
+    print(f"  {name:<40} median {results[name]['median_s'] * 1000:9.2f} ms  min {results[name]['min_s'] * 1000:9.2f} ms")
+
+
+def run(pages: List[int], repeat: int, latency_ms: float, e2e_repeat: int) -> Dict[str, Dict[str, float]]:
+    corpus = make_related_papers(make_paper(max(pages)), 200)
+    server = MockScholarServer(corpus, latency_ms=latency_ms).start()
+    os.environ["SEMANTIC_SCHOLAR_SEARCH_URL"] = f"{server.base_url}/graph/v1/paper/search"
+    os.environ["OPENALEX_SEARCH_URL"] = f"{server.base_url}/works"
+
+    # Imported after the environment points the providers at the mock server
+    from fastapi.testclient import TestClient
+
+    import api
+    from src.advanced_bias_analyzer import AdvancedBiasAnalyzer, StatisticalAnalyzer
+    from src.citation_analyzer import CitationAnalyzer
+    from src.plagiarism_checker import analyze_section, clear_section_memo, extract_sections, similarity_percent
+    from src.quality_assessor import QualityAssessor
+
+    bias, stats, quality = AdvancedBiasAnalyzer(), StatisticalAnalyzer(), QualityAssessor()
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        with TestClient(api.app) as client:
+            for n in pages:
+                text = make_paper(n, seed=n)
+                pdf = make_pdf(text)
+                print(f"{n} page(s): {len(text):,} chars, {len(pdf):,} byte PDF")
+                bench(results, f"extract_pdf_text[{n}p]", lambda: api.extract_pdf_text_from_bytes(pdf), repeat)
+                results[f"extract_pdf_text[{n}p]"]["pages_per_s"] = n / results[f"extract_pdf_text[{n}p]"]["median_s"]
+                bench(results, f"extract_sections[{n}p]", lambda: extract_sections(text), repeat)
+                sections = extract_sections(text)
+                candidates = [f"{c['title']}\n{c['abstract']}" for c in corpus[:12]]
+                bench(results, f"similarity_percent x12[{n}p]",
+                      lambda: [similarity_percent(sections["Methodology"], c) for c in candidates], repeat)
+                bench(results, f"analyze_section[{n}p]", lambda: analyze_section(sections["Methodology"]), e2e_repeat)
+                bench(results, f"bias_patterns[{n}p]", lambda: bias.linguistic_pattern_detector(text), repeat)
+                bench(results, f"statistics[{n}p]", lambda: (stats.detect_p_hacking(stats.extract_p_values(text)), stats.validate_methodology(text)), repeat)
+                bench(results, f"quality_score[{n}p]", lambda: quality.calculate_unified_quality_score(text), repeat)
+
+                def post(path: str, fresh: bool = True):
+                    if fresh:
+                        clear_section_memo()  # time full retrieval, not memoized sections
+                    resp = client.post(path, files={"file": ("paper.pdf", pdf, "application/pdf")})
+                    resp.raise_for_status()
+
+                bench(results, f"POST /analyze[{n}p]", lambda: post("/analyze"), e2e_repeat)
+                bench(results, f"POST /analyze/full[{n}p]", lambda: post("/analyze/full"), e2e_repeat)
+                bench(results, f"POST /analyze resubmitted[{n}p]", lambda: post("/analyze", fresh=False), e2e_repeat)
+
+            for nodes in (200, 1000):
+                rng = random.Random(nodes)
+                papers = [{"id": f"p{i}", "metadata": {"title": f"Paper {i}"},
+                           "citations": [f"p{rng.randrange(nodes)}" for _ in range(rng.randint(0, 10))]}
+                          for i in range(nodes)]
+                print(f"citation graph: {nodes} papers")
+
+                def metrics():
+                    analyzer = CitationAnalyzer()
+                    analyzer.build_citation_network(papers)
+                    return analyzer.calculate_impact_metrics()
+
+                bench(results, f"citation_metrics[{nodes}]", metrics, max(1, repeat // 2))
+    finally:
+        server.stop()
+    return results
+
+
+def load_results(ref: str) -> Optional[Dict[str, object]]:
+    path = ref if os.path.exists(ref) else os.path.join(RESULTS_DIR, f"{ref}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current: Dict[str, Dict[str, float]], baseline: Dict[str, object], threshold: float) -> int:
+    """Print median ratios against `baseline`; return the number of regressions."""
+    print(f"\nComparison against {baseline.get('commit')} (regression if > {threshold:.2f}x):")
+    regressions = 0
+    base_results: Dict[str, Dict[str, float]] = baseline.get("results", {})  # type: ignore[assignment]
+    for name, cur in current.items():
+        base = base_results.get(name)
+        if not base:
+            print(f"  {name:<40} (new)")
+            continue
+        ratio = cur["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        flag = "REGRESSION" if ratio > threshold else ("faster" if ratio < 1 / threshold else "")
+        regressions += flag == "REGRESSION"
+        print(f"  {name:<40} {base['median_s'] * 1000:9.2f} -> {cur['median_s'] * 1000:9.2f} ms  {ratio:5.2f}x {flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", default="2,10,50", help="Comma-separated synthetic paper sizes in pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per in-process benchmark")
+    parser.add_argument("--e2e-repeat", type=int, default=3, help="Timed runs per network/end-to-end benchmark")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mock API latency per request")
+    parser.add_argument("--compare", help="Baseline results file or commit id")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Median slowdown ratio counted as a regression")
+    parser.add_argument("--no-save", action="store_true", help="Do not write a results file")
+    args = parser.parse_args()
+
+    pages = [int(p) for p in args.pages.split(",") if p.strip()]
+    results = run(pages, args.repeat, args.latency_ms, args.e2e_repeat)
+    record = {
+        "commit": commit_id(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {"pages": pages, "repeat": args.repeat, "e2e_repeat": args.e2e_repeat, "latency_ms": args.latency_ms},
+        "results": results,
+    }
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{record['commit']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2)
+        print(f"\nResults written to {path}")
+    if args.compare:
+        baseline = load_results(args.compare)
+        if baseline is None:
+            print(f"No baseline results found for {args.compare}")
+            return 2
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Deterministic synthetic papers and PDFs for benchmarking.
+
+Papers use the headings `extract_sections` recognises and sprinkle in the
+phrases the bias, statistics and quality analyzers look for, so every stage
+does representative work. PDFs are written by a tiny dependency-free writer
+(one Helvetica text stream per page), which pdfplumber reads like any other
+text PDF.
+"""
+import random
+from typing import Dict, List
+
+VOCABULARY = (
+    "model data analysis method result approach network learning training evaluation "
+    "sample performance feature dataset experiment baseline accuracy error signal "
+    "distribution parameter estimate variance bias protocol cohort treatment outcome "
+    "measurement effect hypothesis regression classifier corpus annotation metric "
+    "significant robust efficient novel framework pipeline retrieval similarity"
+).split()
+
+SIGNAL_PHRASES = [
+    "This clearly shows that our approach outperforms the baseline.",
+    "As expected, the results confirm our hypothesis.",
+    "The sample was limited to university students.",
+    "Participants were randomly assigned to a control group (n = {n}).",
+    "This was a double-blind, randomized study.",
+    "The effect was significant (p = 0.04{d}).",
+    "Another comparison gave p < 0.0{d}.",
+    "The data are available in a public data repository.",
+    "Our source code is available at github.com/example/repo.",
+]
+
+SECTIONS = ["Abstract", "1. Introduction", "2. Methods", "3. Results", "4. Discussion", "5. Conclusion", "References"]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(VOCABULARY, k=rng.randint(8, 20))
+    return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    out: List[str] = []
+    for _ in range(sentences):
+        if rng.random() < 0.15:
+            out.append(rng.choice(SIGNAL_PHRASES).format(n=rng.randint(20, 2000), d=rng.randint(1, 9)))
+        else:
+            out.append(_sentence(rng))
+    return " ".join(out)
+
+
+def make_paper(pages: int, seed: int = 0, line_width: int = 90) -> str:
+    """A paper of roughly `pages` PDF pages (about 50 wrapped lines per page)."""
+    rng = random.Random(seed)
+    target_lines = max(1, pages) * 50
+    title = "A Synthetic Study of " + " ".join(w.capitalize() for w in rng.sample(VOCABULARY, 4))
+    lines: List[str] = [title]
+    per_section = max(4, target_lines // len(SECTIONS))
+    for heading in SECTIONS:
+        lines.append("")
+        lines.append(heading)
+        body: List[str] = []
+        while len(body) < per_section:
+            if heading == "References":
+                body.append(f"[{len(body) + 1}] {_sentence(rng)}")
+                continue
+            body.extend(_wrap(_paragraph(rng, rng.randint(3, 7)), line_width))
+        lines.extend(body[:per_section])
+    return "\n".join(lines) + "\n"
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines: List[str] = []
+    current = ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def make_related_papers(paper: str, count: int, seed: int = 0) -> List[Dict[str, str]]:
+    """Candidate 'published' papers, some reusing sentences from `paper`."""
+    rng = random.Random(seed)
+    sentences = [s.strip() + "." for s in paper.replace("\n", " ").split(".") if len(s.split()) > 5]
+    out = []
+    for i in range(count):
+        borrowed = rng.sample(sentences, min(len(sentences), rng.randint(0, 4))) if sentences else []
+        abstract = " ".join(borrowed + [_sentence(rng) for _ in range(rng.randint(3, 8))])
+        out.append({
+            "id": f"W{seed}{i:04d}",
+            "title": "On " + " ".join(w.capitalize() for w in rng.sample(VOCABULARY, 3)),
+            "abstract": abstract,
+        })
+    return out
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """Render `text` into a minimal multi-page PDF, one text line per PDF line."""
+    lines = text.splitlines() or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    objects: List[bytes] = []  # object n is objects[n - 1]
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    page_ids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in page_lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_obj, font, content)
+        ))
+    kids = b" ".join(b"%d 0 R" % p for p in page_ids)
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % n + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src.document import Document
+
+PAPER = """A Study of Things
+Abstract
+We study things. The results are encouraging.
+
+1. Introduction
+Things matter.
+
+2. Methods
+Participants were randomly assigned (n = 120).
+
+3. Results
+It worked (p < 0.05).
+
+5 Conclusion
+Things are good.
+
+References
+[1] Someone. 2020.
+"""
+
+
+class TestDocument(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = Document(PAPER)
+
+    def test_heading_map(self):
+        """Numbered and unnumbered headings map to canonical section names."""
+        self.assertEqual(
+            [h.name for h in self.doc.headings],
+            ["Abstract", "Introduction", "Methodology", "Results", "Conclusions", "References"],
+        )
+        heading = self.doc.heading_map["Methodology"]
+        self.assertEqual(PAPER[heading.start:heading.end], "2. Methods")
+
+    def test_sections_stop_at_next_heading(self):
+        """Each section runs until the next recognised heading of any kind."""
+        sections = self.doc.sections
+        self.assertEqual(sections["Title"], "A Study of Things")
+        self.assertEqual(sections["Abstract"], "We study things. The results are encouraging.")
+        self.assertEqual(sections["Methodology"], "Participants were randomly assigned (n = 120).")
+        self.assertEqual(sections["Conclusions"], "Things are good.")
+
+    def test_views_are_cached_and_offsets_line_up(self):
+        """Views are computed once, and line/sentence spans index into the raw text."""
+        self.assertIs(self.doc.lower, self.doc.lower)
+        start, end = self.doc.line_spans[0]
+        self.assertEqual(PAPER[start:end], "A Study of Things")
+        self.assertIn("The results are encouraging.", self.doc.sentences)
+        self.assertIs(Document.ensure(self.doc), self.doc)
+
+    def test_fallback_without_headings(self):
+        """Without headings the positional fallbacks still fill every section."""
+        sections = Document("Just a title\nsome body text").sections
+        self.assertEqual(sections["Abstract"], "Just a title some body text")
+
+if __name__ == '__main__':
+    unittest.main()
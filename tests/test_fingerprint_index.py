@@ -0,0 +1,136 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src.fingerprint_index import FingerprintIndex, FingerprintJournal, build_index, fingerprint, winnow
+
+SOURCE = (
+    "Background material. The quick brown fox jumps over the lazy dog while the cat "
+    "sleeps quietly near a warm fireplace in winter. Unrelated words pad the rest."
+)
+QUERY = (
+    "Our paper starts differently. The Quick brown fox jumps over the lazy dog, while the "
+    "cat sleeps quietly near a warm fireplace in winter! Then we diverge entirely."
+)
+
+
+class TestFingerprintIndex(unittest.TestCase):
+
+    def setUp(self):
+        """Index one overlapping and one unrelated document."""
+        self.index = build_index([
+            ("source", SOURCE),
+            ("other", "nothing in common with anything else written here at all"),
+        ])
+
+    def test_winnow_covers_every_window(self):
+        """Every window of w hashes must contain a selected fingerprint."""
+        hashes = [7, 3, 9, 3, 8, 1, 6, 6, 5, 2, 4]
+        positions = [pos for _, pos in winnow(hashes, w=4)]
+        for start in range(len(hashes) - 3):
+            self.assertTrue(any(start <= p < start + 4 for p in positions))
+
+    def test_query_returns_copied_passage_with_offsets(self):
+        """Copied text is found despite case/punctuation changes, with offsets into both docs."""
+        passages = self.index.query(QUERY)
+        self.assertEqual(len(passages), 1)
+        p = passages[0]
+        self.assertEqual(p["source"], "source")
+        self.assertIn("brown fox jumps over the lazy dog", QUERY[p["start"]:p["end"]].lower())
+        self.assertIn("brown fox jumps over the lazy dog", SOURCE[p["source_start"]:p["source_end"]])
+
+    def test_incremental_insert_and_exclude(self):
+        """A newly added document is searchable and can be excluded from its own query."""
+        self.index.add_document("query", QUERY)
+        self.assertEqual(self.index.add_document("query", QUERY), 0)
+        sources = {p["source"] for p in self.index.query(QUERY, exclude="query")}
+        self.assertEqual(sources, {"source"})
+
+    def test_boilerplate_shared_by_many_documents_is_ignored(self):
+        """Fingerprints above max_df neither match nor keep collecting postings."""
+        boilerplate = "The rest of this paper is organized as follows in several sections below."
+        index = FingerprintIndex(max_df=3)
+        for i in range(6):
+            index.add_document(f"paper{i}", f"Paper {i} studies topic number {i}. {boilerplate}")
+        self.assertEqual(index.query(f"A new submission. {boilerplate}"), [])
+        self.assertTrue(all(len(posts) <= 3 for posts in index._table.values()))
+
+    def test_save_and_load_roundtrip(self):
+        """A saved index answers queries identically after loading."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            self.index.save(path)
+            loaded = FingerprintIndex.load(path)
+        self.assertEqual(loaded.doc_ids, self.index.doc_ids)
+        self.assertEqual(loaded.query(QUERY), self.index.query(QUERY))
+        self.assertEqual((loaded.max_df, loaded.n_postings), (self.index.max_df, self.index.n_postings))
+        hashes = [h for h, _, _ in fingerprint(SOURCE)]
+        self.assertEqual([loaded.document_frequency(h) for h in hashes], [self.index.document_frequency(h) for h in hashes])
+
+    def test_loaded_base_is_memory_mapped_and_merges_additions(self):
+        """Loaded arrays are mapped from the file; documents added afterwards are merged by the next save."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            self.index.save(path)
+            loaded = FingerprintIndex.load(path)
+            self.assertIsInstance(loaded._base_postings, np.memmap)
+            self.assertEqual(loaded._table, {})
+            loaded.add_document("query", QUERY)
+            self.assertEqual({p["source"] for p in loaded.query(QUERY, exclude="query")}, {"source"})
+            loaded.save(path)
+            merged = FingerprintIndex.load(path)
+        self.assertEqual(merged.doc_ids, ["source", "other", "query"])
+        self.assertEqual(merged.n_postings, loaded.n_postings)
+        self.assertEqual({p["source"] for p in merged.query(QUERY)}, {"source", "query"})
+
+    def test_journal_shares_additions_between_worker_indexes(self):
+        """Documents journaled by one worker reach another worker and the merged index file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = FingerprintJournal(os.path.join(tmp, "journal.sqlite3"))
+            worker_a, worker_b = FingerprintIndex(), FingerprintIndex()
+            for index, doc_id, text in ((worker_a, "source", SOURCE), (worker_b, "other", "unrelated words " * 10)):
+                journal.append(doc_id, fingerprint(text))
+                journal.sync(index)
+            self.assertEqual(journal.sync(worker_b), 0)
+            self.assertEqual(sorted(worker_b.doc_ids), ["other", "source"])
+            self.assertEqual([p["source"] for p in worker_b.query(QUERY)], ["source"])
+
+            path = os.path.join(tmp, "index.npz")
+            journal.merge_into_file(worker_a, path)
+            self.assertEqual(sorted(FingerprintIndex.load(path).doc_ids), ["other", "source"])
+            self.assertEqual(journal.sync(FingerprintIndex()), 0)
+
+    def test_replacing_a_document_retires_its_earlier_version(self):
+        """A revision replaces its earlier version's postings, in memory, on disk and via the journal."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            self.index.save(path)
+            index = FingerprintIndex.load(path)
+            index.add_document("source", "An entirely rewritten version that shares no passage with the query at all.", replace=True)
+            self.assertEqual(index.query(QUERY), [])
+            self.assertEqual(len(index), 2)
+            self.assertTrue(all(index.document_frequency(h) == 0 for h, _, _ in fingerprint(SOURCE)))
+
+            index.save(path)
+            reloaded = FingerprintIndex.load(path)
+            self.assertEqual(sorted(reloaded.doc_ids), ["other", "source"])
+            self.assertEqual(reloaded.query(QUERY), [])
+            self.assertEqual(reloaded.query("entirely rewritten version that shares no passage with")[0]["source"], "source")
+
+            journal = FingerprintJournal(os.path.join(tmp, "journal.sqlite3"))
+            worker_a, worker_b = FingerprintIndex(), FingerprintIndex()
+            journal.append("draft", fingerprint(SOURCE))
+            journal.sync(worker_a)
+            journal.append("draft", fingerprint("Unrelated words only in the second revision of this draft here."), replace=True)
+            for worker in (worker_a, worker_b):
+                journal.sync(worker)
+                self.assertEqual((len(worker), worker.query(QUERY)), (1, []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+import threading
+from unittest import mock
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src import full_analysis, plagiarism_checker
+from src.full_analysis import run_full_analysis
+from src.plagiarism_checker import SECTION_NAMES, SECTION_WEIGHTS, clear_section_memo
+
+PAPER = """Budgets for concurrent analysis stages
+
+Abstract
+We study how resubmitted papers change between revisions (p = 0.03).
+
+Methodology
+We compare consecutive versions of each manuscript with a control group.
+
+Conclusions
+Most revisions touch only one or two sections.
+"""
+
+RELATED = [
+    {"title": "Revisions of manuscripts", "abstract": "How papers change between revisions and versions.", "url": "https://example.org/1"},
+    {"title": "Control groups", "abstract": "We compare versions with a control group.", "url": "https://example.org/2"},
+]
+
+
+class TestRunFullAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        clear_section_memo()
+        self.release = threading.Event()
+        patcher = mock.patch.object(plagiarism_checker, 'search_related_papers', side_effect=self._search)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_section_memo)
+        self.addCleanup(self.release.set)
+        self.slow_text = None
+        self.failing_text = None
+
+    def _search(self, query_text, max_results=8):
+        if self.slow_text is not None and self.slow_text in query_text:
+            self.release.wait(5)
+        if self.failing_text and self.failing_text in query_text:
+            raise RuntimeError("provider exploded")
+        return RELATED
+
+    def test_all_stages_complete(self):
+        report = run_full_analysis(PAPER)
+        self.assertEqual({k: v["status"] for k, v in report["stages"].items()},
+                         {"plagiarism": "ok", "bias": "ok", "statistics": "ok", "quality": "ok"})
+        result = report["stages"]["plagiarism"]["result"]
+        self.assertEqual(set(result["sections"]), set(SECTION_NAMES))
+        self.assertNotIn("missing_sections", result)
+        self.assertEqual(report["stages"]["statistics"]["result"]["p_values"], [0.03])
+
+    def test_slow_section_times_out_and_overall_is_reweighted(self):
+        """Sections past the budget are missing; the overall score averages the rest."""
+        self.slow_text = "consecutive versions"
+        report = run_full_analysis(PAPER, budgets={"plagiarism": 0.3})
+        stage = report["stages"]["plagiarism"]
+        self.assertEqual(stage["status"], "timeout")
+        result = stage["result"]
+        self.assertEqual(result["missing_sections"], ["Methodology"])
+        done = [name for name in SECTION_NAMES if name != "Methodology"]
+        weights = SECTION_WEIGHTS[[SECTION_NAMES.index(n) for n in done]]
+        expected = sum(w * result["sections"][n]["best_similarity_percent"] for w, n in zip(weights / weights.sum(), done))
+        self.assertAlmostEqual(result["overall_percent"], expected, places=1)
+        self.assertEqual(report["stages"]["bias"]["status"], "ok")
+
+    def test_failing_section_is_reported_as_error(self):
+        self.failing_text = "resubmitted papers"
+        stage = run_full_analysis(PAPER)["stages"]["plagiarism"]
+        self.assertEqual(stage["status"], "error")
+        self.assertTrue(stage["errors"][0].startswith("Abstract: provider exploded"))
+        self.assertEqual(stage["result"]["missing_sections"], ["Abstract"])
+
+    def test_slow_analyzer_times_out_without_blocking_others(self):
+        def slow_bias(doc):
+            self.release.wait(5)
+            return {}
+
+        with mock.patch.dict(full_analysis.ANALYZER_STAGES, {"bias": slow_bias}):
+            report = run_full_analysis(PAPER, budgets={"bias": 0.2})
+        self.assertEqual(report["stages"]["bias"]["status"], "timeout")
+        self.assertIsNone(report["stages"]["bias"]["result"])
+        self.assertEqual(report["stages"]["quality"]["status"], "ok")
+
+    def test_concurrent_slow_searches_do_not_starve_analyzers(self):
+        """Section searches filling their pool must not queue the analyzers past their budgets."""
+        self.slow_text = ""  # every search blocks
+        budgets = {"plagiarism": 0.3, "bias": 0.3, "statistics": 0.3, "quality": 0.3}
+        reports = []
+        calls = [threading.Thread(target=lambda: reports.append(run_full_analysis(PAPER, budgets=budgets))) for _ in range(5)]
+        for t in calls:
+            t.start()
+        for t in calls:
+            t.join()
+        self.release.set()
+        full_analysis.shutdown_pools(wait=True)  # searches still running would refill the memo
+        self.assertEqual(len(reports), 5)
+        for report in reports:
+            self.assertEqual(report["stages"]["plagiarism"]["status"], "timeout")
+            self.assertEqual({report["stages"][name]["status"] for name in full_analysis.ANALYZER_STAGES}, {"ok"})
+
+if __name__ == '__main__':
+    unittest.main()
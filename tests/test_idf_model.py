@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src.idf_model import ReferenceIdfModel
+
+CORPUS = [
+    "Randomized controlled trials of aspirin in cardiovascular prevention.",
+    "Deep neural networks for image classification on large datasets.",
+    "Transformer language models improve machine translation quality.",
+    "A cohort study of aspirin use and colorectal cancer risk.",
+    "Graph neural networks for citation network analysis.",
+]
+
+
+class TestReferenceIdfModel(unittest.TestCase):
+
+    def setUp(self):
+        self.model = ReferenceIdfModel.fit(CORPUS, min_df=1)
+
+    def test_transform_matches_sklearn(self):
+        """Rows equal those of a TfidfVectorizer fitted on the same corpus."""
+        expected = TfidfVectorizer(stop_words="english").fit(CORPUS).transform(CORPUS).toarray()
+        np.testing.assert_allclose(self.model.transform(CORPUS).toarray(), expected, atol=1e-6)
+
+    def test_similarities_rank_related_text_first(self):
+        """Scores are cosine similarities against the reference weights."""
+        sims = self.model.similarities("aspirin trials for cancer prevention", CORPUS)
+        self.assertEqual(int(np.argmax(sims)), 0)
+        self.assertAlmostEqual(float(self.model.similarities(CORPUS[1], [CORPUS[1]])[0]), 1.0, places=6)
+
+    def test_save_and_load_memory_maps_idf(self):
+        """A saved model loads with a memory-mapped IDF vector and scores identically."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.model.save(tmp)
+            loaded = ReferenceIdfModel.load(tmp)
+            self.assertIsInstance(loaded.idf, np.memmap)
+            self.assertIsInstance(loaded.vocabulary, np.memmap)
+            np.testing.assert_allclose(
+                loaded.similarities(CORPUS[0], CORPUS), self.model.similarities(CORPUS[0], CORPUS), atol=1e-6,
+            )
+            del loaded
+
+    def test_unsorted_vocabulary_keeps_term_weights(self):
+        """Terms given out of order are sorted together with their IDF weights."""
+        model = ReferenceIdfModel(["zebra", "aspirin", "trial"], np.array([3.0, 1.0, 2.0]), stop_words=None)
+        self.assertEqual(list(model.vocabulary), ["aspirin", "trial", "zebra"])
+        self.assertEqual(list(model.term_indices(["zebra", "unknown", "aspirin"])), [2, 0])
+        np.testing.assert_allclose(model.transform(["zebra"]).toarray(), [[0.0, 0.0, 1.0]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import api
+from src.instrumentation import REQUEST_SECONDS, SamplingProfiler, finish_request, server_timing, span, start_request, submit_with_context
+
+
+def _busy_wait_for_profiler(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_server_timing_sums_repeated_stages(self):
+        header = server_timing([("search", 10.0), ("scoring", 2.5), ("search", 5.0)], total_ms=20.0)
+        self.assertEqual(header, 'search;desc="x2";dur=15.0, scoring;dur=2.5, total;dur=20.0')
+
+    def test_spans_from_worker_threads_reach_the_request(self):
+        """submit_with_context carries the request's span collector into pool threads."""
+        token = start_request()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [submit_with_context(pool, self._timed_block, f"stage{i}") for i in range(2)]
+            for fut in futures:
+                fut.result()
+            pool.submit(self._timed_block, "lost").result()  # plain submit has no collector
+        names = [name for name, _ in finish_request(token)]
+        self.assertIn("stage0", names)
+        self.assertIn("stage1", names)
+        self.assertNotIn("lost", names)
+
+    @staticmethod
+    def _timed_block(name):
+        with span(name):
+            time.sleep(0.001)
+
+    def test_sampling_profiler_collects_folded_stacks(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_wait_for_profiler, args=(stop,))
+        profiler = SamplingProfiler(interval=0.001).start()
+        worker.start()
+        time.sleep(0.05)
+        profiler.stop()
+        stop.set()
+        worker.join()
+        folded = profiler.folded()
+        self.assertIn("_busy_wait_for_profiler", folded)
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines()))
+
+    def test_request_metrics_use_route_templates(self):
+        """Unknown URLs share one 'unmatched' series instead of one per path."""
+        client = TestClient(api.app)
+        for i in range(3):
+            client.get(f"/probe-{i}")
+        response = client.get("/health")
+        self.assertIn("total;dur=", response.headers["Server-Timing"])
+        paths = {s.labels["path"] for m in REQUEST_SECONDS.collect() for s in m.samples}
+        self.assertIn("unmatched", paths)
+        self.assertIn("/health", paths)
+        self.assertFalse(any(p.startswith("/probe-") for p in paths))
+
+if __name__ == '__main__':
+    unittest.main()
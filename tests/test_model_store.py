@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src.model_store import ModelStore
+from src.traditional_models import TFIDF_MODEL_NAME, EnsembleModel, TraditionalModels
+
+SENTENCES = [
+    ("This study was funded by a major corporation.", 1),
+    ("Only positive trials were selected for publication.", 2),
+    ("We report results that confirm our prior hypothesis.", 3),
+    ("The sponsor reviewed the manuscript before submission.", 1),
+    ("The methodology is sound and the results are clear.", 0),
+    ("Participants were randomly assigned to two groups.", 0),
+    ("The sample was drawn from a national registry.", 0),
+    ("Data were analyzed with standard regression methods.", 0),
+] * 3
+
+
+class TestModelStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ModelStore(self.tmp.name)
+        df = pd.DataFrame(SENTENCES, columns=['sentence', 'label'])
+        self.models = TraditionalModels()
+        self.model, self.vectorizer = self.models.train_tfidf_model(df, store=self.store)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_saved_tfidf_model_loads_memory_mapped_and_shared(self):
+        """Loading returns the same predictions, mmapped arrays, and one instance per process."""
+        model, vectorizer = self.models.load_tfidf_model(self.store)
+        self.assertIsInstance(model.coef_, np.memmap)
+        texts = [s for s, _ in SENTENCES]
+        np.testing.assert_array_equal(
+            model.predict(vectorizer.transform(texts)), self.model.predict(self.vectorizer.transform(texts))
+        )
+        self.assertIs(self.models.load_tfidf_model(self.store)[0], model)
+
+    def test_each_save_is_a_new_version(self):
+        """Saves are versioned; the manifest carries the training metadata."""
+        self.store.save_sklearn(TFIDF_MODEL_NAME, {'model': self.model, 'vectorizer': self.vectorizer})
+        self.assertEqual(self.store.versions(TFIDF_MODEL_NAME), [1, 2])
+        self.assertIn('accuracy', self.store.manifest(TFIDF_MODEL_NAME, 1)['metadata'])
+
+    def test_ensemble_uses_loaded_tfidf_model(self):
+        """EnsembleModel votes with the stored TF-IDF model instead of receiving None."""
+        model, vectorizer = self.models.load_tfidf_model(self.store)
+        ensemble = EnsembleModel(None, model, self.models.rule_based_detector, vectorizer=vectorizer)
+        self.assertEqual(ensemble.predict("This study was funded by a major corporation."), "Funding Bias")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+import sys
+import os
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src.plagiarism_checker import decode_inverted_abstract
+
+
+class TestDecodeInvertedAbstract(unittest.TestCase):
+
+    def test_words_come_back_in_reading_order(self):
+        """Repeated words and keys listed out of order still decode to the original sentence."""
+        inverted = {"the": [0, 4], "model": [5], "sees": [3], "data": [2], "training": [1]}
+        self.assertEqual(decode_inverted_abstract(inverted), "the training data sees the model")
+
+    def test_empty_and_missing_indexes(self):
+        self.assertEqual(decode_inverted_abstract(None), "")
+        self.assertEqual(decode_inverted_abstract({}), "")
+
+    def test_absurd_positions_do_not_allocate(self):
+        """A huge position is ordered like any other; negative or non-integer ones are dropped."""
+        inverted = {"end": [10 ** 12], "start": [0], "bad": [-3, "x"]}
+        self.assertEqual(decode_inverted_abstract(inverted), "start end")
+
+if __name__ == '__main__':
+    unittest.main()
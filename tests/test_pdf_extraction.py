@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the repo root (benchmarks) and backend directory (`src.*`) to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from src.pdf_extraction import extract_pdf_text, page_text_ok, pdfium
+from benchmarks.synthetic import make_paper, make_pdf
+
+# Two full pages and a one-line last page that the fast engine's quality check rejects
+LINES = make_paper(3, seed=7).splitlines()
+PDF = make_pdf("\n".join(LINES[:100] + ["Short."]))
+
+
+class TestPageTextOk(unittest.TestCase):
+
+    def test_quality_check(self):
+        sentence = "Participants were randomly assigned to treatment and control groups. "
+        self.assertTrue(page_text_ok(sentence * 3))
+        self.assertFalse(page_text_ok("Short."))
+        self.assertFalse(page_text_ok(sentence * 2 + "�" * 5))
+        self.assertFalse(page_text_ok("Participantswererandomlyassignedtotreatmentandcontrolgroups " * 3))
+
+
+class TestExtractPdfText(unittest.TestCase):
+
+    def test_pdfplumber_reads_every_page(self):
+        text, info = extract_pdf_text(PDF, backend="pdfplumber")
+        self.assertEqual((info["pages"], info["pages_read"], info["fallback_pages"]), (3, 3, 0))
+        self.assertFalse(info["truncated"])
+        self.assertIn(LINES[0], text)
+        self.assertTrue(text.rstrip().endswith("Short."))
+
+    @unittest.skipIf(pdfium is None, "pypdfium2 not installed")
+    def test_pdfium_falls_back_for_short_page_from_any_source(self):
+        """The lazy pdfplumber fallback works from bytes, a spooled file and a path, and matches pdfplumber."""
+        expected, _ = extract_pdf_text(PDF, backend="pdfplumber")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "paper.pdf")
+            with open(path, "wb") as f:
+                f.write(PDF)
+            spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+            spooled.write(PDF)
+            spooled.seek(0)
+            for source in (PDF, spooled, path):
+                text, info = extract_pdf_text(source, backend="pdfium")
+                self.assertEqual(info["fallback_pages"], 1)
+                self.assertEqual(" ".join(text.split()), " ".join(expected.split()))
+            spooled.close()
+
+    def test_page_and_char_caps_mark_truncation(self):
+        text, info = extract_pdf_text(PDF, max_pages=1)
+        self.assertEqual((info["pages"], info["pages_read"], info["truncated"]), (3, 1, True))
+        text, info = extract_pdf_text(PDF, max_chars=200)
+        self.assertEqual(len(text), 200)
+        self.assertTrue(info["truncated"])
+        self.assertEqual(info["pages_read"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src.provider_client import CircuitBreaker, ProviderClient, ProviderUnavailable
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Replies with the next (status, headers, delay) from the server's script."""
+
+    def do_GET(self):
+        status, headers, delay = self.server.script.pop(0) if self.server.script else (200, {}, 0)
+        self.server.hits += 1
+        time.sleep(delay)
+        body = json.dumps({"ok": status == 200}).encode()
+        try:
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client timed out and hung up
+
+    def log_message(self, *args):
+        pass
+
+
+class TestProviderClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+        self.server.script = []
+        self.server.hits = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/search"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_429_honoring_retry_after(self):
+        """A 429 is retried after the Retry-After delay and then succeeds."""
+        self.server.script = [(429, {"Retry-After": "0.2"}, 0)]
+        client = ProviderClient("test", self.url, backoff=0.01)
+        start = time.perf_counter()
+        self.assertEqual(client.get_json({"q": "x"}), {"ok": True})
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+        self.assertEqual(client.stats()["retries"], 1)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        """After `threshold` failed calls the provider is skipped without a request."""
+        self.server.script = [(503, {}, 0)] * 10
+        client = ProviderClient("test", self.url, max_retries=0, breaker=CircuitBreaker(threshold=2, cooldown=60))
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                client.get_json({})
+        hits = self.server.hits
+        with self.assertRaises(ProviderUnavailable):
+            client.get_json({})
+        self.assertEqual(self.server.hits, hits)
+        self.assertEqual(client.stats()["circuit"], "open")
+
+    def test_timeouts_are_not_retried_and_open_the_circuit(self):
+        """A hung provider costs one timeout per call and is skipped after `threshold` of them."""
+        self.server.script = [(200, {}, 0.5)] * 4
+        client = ProviderClient("test", self.url, timeout=0.1, max_retries=2, breaker=CircuitBreaker(threshold=2, cooldown=60))
+        for _ in range(2):
+            start = time.perf_counter()
+            with self.assertRaises(Exception):
+                client.get_json({})
+            self.assertLess(time.perf_counter() - start, 0.4)
+        with self.assertRaises(ProviderUnavailable):
+            client.get_json({})
+        self.assertEqual((self.server.hits, client.stats()["retries"]), (2, 0))
+
+    def test_each_failed_attempt_counts_toward_the_breaker(self):
+        """Retried 5xx attempts are all recorded, so one failing call can open the circuit."""
+        self.server.script = [(503, {}, 0)] * 5
+        client = ProviderClient("test", self.url, backoff=0.01, max_retries=5, breaker=CircuitBreaker(threshold=3, cooldown=60))
+        with self.assertRaises(Exception):
+            client.get_json({})
+        self.assertEqual(self.server.hits, 3)
+        self.assertEqual(client.stats()["circuit"], "open")
+
+    def test_hedged_request_wins_over_slow_primary(self):
+        """A hedge fired after `hedge_after` returns before the slow primary."""
+        self.server.script = [(200, {}, 1.0)]
+        client = ProviderClient("test", self.url, hedge_after=0.05)
+        start = time.perf_counter()
+        self.assertEqual(client.get_json({}), {"ok": True})
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertEqual(client.stats()["hedges"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,8 @@ import unittest
 import sys
 import os
 
-# Add the src directory to the Python path to import our modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
 
 from src.quality_assessor import QualityAssessor
 
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the repo root (benchmarks) and backend directory (`src.*`) to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from src.scan import scan_corpus
+from benchmarks.synthetic import make_paper, make_pdf
+
+PAPERS = {
+    'a.txt': "Results\nThe treatment improved outcomes (p = 0.04). Data are available on request.\n",
+    'b.txt': "Methods\nWe used a randomized design with a control group of 120 participants.\n",
+    'c.txt': "   \n",
+}
+
+
+class TestScanCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.corpus = os.path.join(self.tmp.name, 'corpus')
+        os.makedirs(self.corpus)
+        for name, text in PAPERS.items():
+            with open(os.path.join(self.corpus, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        self.output = os.path.join(self.tmp.name, 'scan.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _records(self):
+        with open(self.output, encoding='utf-8') as f:
+            return {r['id']: r for r in map(json.loads, f)}
+
+    def test_scan_writes_one_record_per_document(self):
+        """Every document gets a record; empty ones carry an error instead of failing the scan."""
+        summary = scan_corpus(self.corpus, self.output, workers=0, chunk_size=2)
+        self.assertEqual(summary['scanned'], 3)
+        records = self._records()
+        self.assertEqual(set(records), set(PAPERS))
+        self.assertEqual(records['a.txt']['p_values'], [0.04])
+        self.assertTrue(records['b.txt']['mentions_randomization'])
+        self.assertIsNotNone(records['c.txt']['error'])
+
+    def test_pdf_with_short_page_uses_fallback(self):
+        """A PDF whose last page is too short for the fast engine is still scanned without error."""
+        lines = make_paper(3, seed=3).splitlines()
+        with open(os.path.join(self.corpus, 'd.pdf'), 'wb') as f:
+            f.write(make_pdf("\n".join(lines[:100] + ["Short."])))
+        scan_corpus(self.corpus, self.output, workers=0)
+        record = self._records()['d.pdf']
+        self.assertIsNone(record['error'])
+        self.assertEqual(record['pages'], 3)
+        self.assertGreater(record['chars'], 1000)
+
+    def test_resume_skips_completed_documents(self):
+        """An interrupted output (cut-off last line) resumes with only the missing documents."""
+        scan_corpus(self.corpus, self.output, workers=0)
+        with open(self.output, encoding='utf-8') as f:
+            lines = f.readlines()
+        with open(self.output, 'w', encoding='utf-8') as f:
+            f.writelines(lines[:2])
+            f.write(lines[2][:10])
+        summary = scan_corpus(self.corpus, self.output, workers=2, chunk_size=1)
+        self.assertEqual((summary['skipped'], summary['scanned']), (2, 1))
+        self.assertEqual(len(self._records()), 3)
+
+if __name__ == '__main__':
+    unittest.main()
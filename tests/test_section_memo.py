@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src import plagiarism_checker
+from src.fingerprint_index import FingerprintIndex
+from src.idf_model import ReferenceIdfModel
+from src.plagiarism_checker import analyze_plagiarism, clear_section_memo, section_key
+
+PAPER = """Section memoization for revisions
+
+Abstract
+We study how resubmitted papers change between revisions.
+
+Methodology
+We compare consecutive versions of each manuscript section by section.
+
+Conclusions
+Most revisions touch only one or two sections.
+"""
+
+RELATED = [{"title": "Revisions of manuscripts", "abstract": "How papers change between versions.", "url": "https://example.org/1"}]
+
+
+class TestSectionMemo(unittest.TestCase):
+
+    def setUp(self):
+        clear_section_memo()
+        patcher = mock.patch.object(plagiarism_checker, 'search_related_papers', return_value=RELATED)
+        self.search = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(clear_section_memo)
+
+    def test_key_ignores_whitespace_and_case(self):
+        self.assertEqual(section_key("We  study\nrevisions."), section_key("we study revisions."))
+        self.assertNotEqual(section_key("We study revisions."), section_key("We study resubmissions."))
+
+    def test_revision_only_requeries_changed_sections(self):
+        """A resubmission with one edited section searches for that section alone."""
+        first = analyze_plagiarism(PAPER)
+        self.assertEqual(first["reused_sections"], [])
+        calls = self.search.call_count
+
+        revised = PAPER.replace("one or two sections", "a single section")
+        report = analyze_plagiarism(revised)
+        self.assertEqual(self.search.call_count, calls + 1)
+        self.assertEqual(report["reused_sections"], ["Title", "Abstract", "Methodology"])
+        self.assertEqual(report["sections"]["Abstract"], first["sections"]["Abstract"])
+
+    def test_sections_without_candidates_are_not_stored(self):
+        """An empty search (e.g. providers down) is retried on the next upload."""
+        self.search.return_value = []
+        analyze_plagiarism(PAPER)
+        calls = self.search.call_count
+        report = analyze_plagiarism(PAPER)
+        self.assertGreater(self.search.call_count, calls)
+        self.assertEqual(report["reused_sections"], [])
+
+    def test_revision_is_not_reported_as_copy_of_its_earlier_version(self):
+        """With a submission id the earlier version is excluded and then replaced in the index."""
+        revised = PAPER.replace("section by section.", "section by section. We also add one new sentence.")
+        with mock.patch.multiple(plagiarism_checker, _fingerprint_index=FingerprintIndex(), _fingerprint_journal=None):
+            analyze_plagiarism(PAPER, doc_id="submission:42")
+            report = analyze_plagiarism(revised, doc_id="submission:42")
+            self.assertEqual(report["local_matches"]["covered_percent"], 0.0)
+            index = plagiarism_checker.get_fingerprint_index()
+            self.assertEqual(len(index), 1)
+            # Without the lineage id the revision is just another source
+            self.assertGreater(analyze_plagiarism(revised)["local_matches"]["covered_percent"], 90.0)
+
+    def test_entries_expire_after_ttl(self):
+        """In-process entries are not served past SECTION_CACHE_TTL_S."""
+        with mock.patch.object(plagiarism_checker, 'SECTION_CACHE_TTL_S', -1.0):
+            analyze_plagiarism(PAPER)
+            calls = self.search.call_count
+            report = analyze_plagiarism(PAPER)
+        self.assertEqual(self.search.call_count, 2 * calls)
+        self.assertEqual(report["reused_sections"], [])
+
+    def test_key_changes_when_idf_model_is_rebuilt_in_place(self):
+        """A model refitted into the same IDF_MODEL_PATH gets new keys."""
+        keys = []
+        with tempfile.TemporaryDirectory() as tmp:
+            for corpus in (["revisions of papers", "papers and revisions"], ["revisions of papers", "papers and revisions", "more papers"]):
+                ReferenceIdfModel.fit(corpus, min_df=1).save(tmp)
+                with mock.patch.multiple(plagiarism_checker, IDF_MODEL_PATH=tmp, _idf_model=None, _idf_model_tag=""):
+                    keys.append(section_key("We study revisions."))
+        self.assertNotEqual(keys[0], keys[1])
+        self.assertNotEqual(keys[0], section_key("We study revisions."))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src import serving
+
+
+class TestWorkerRecycle(unittest.TestCase):
+
+    def setUp(self):
+        """Check RSS on every request against a limit the worker is over."""
+        patches = [
+            mock.patch.object(serving, 'MAX_WORKER_RSS_MB', 100.0),
+            mock.patch.object(serving, 'RSS_CHECK_EVERY', 1),
+            mock.patch.object(serving, '_requests', 0),
+            mock.patch.object(serving, '_recycling', False),
+            mock.patch.object(serving, 'worker_rss_mb', return_value=500.0),
+            mock.patch.object(serving.os, 'kill'),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_gunicorn_worker_is_recycled_once(self):
+        """Under gunicorn the worker signals itself once; later requests do not re-signal."""
+        with mock.patch.dict(os.environ, {'SERVER_SOFTWARE': 'gunicorn/22.0.0'}):
+            self.assertTrue(serving.check_worker_recycle())
+            self.assertFalse(serving.check_worker_recycle())
+        serving.os.kill.assert_called_once()
+
+    def test_other_servers_only_log(self):
+        """Without a gunicorn master to replace it, SIGTERM would stop the server: just warn."""
+        with mock.patch.dict(os.environ, {'SERVER_SOFTWARE': ''}):
+            with self.assertLogs('src.serving', level='WARNING'):
+                self.assertFalse(serving.check_worker_recycle())
+            self.assertFalse(serving.check_worker_recycle())
+        serving.os.kill.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
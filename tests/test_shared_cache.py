@@ -0,0 +1,38 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add the backend directory to the Python path so `src.*` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from src.shared_cache import SharedCache
+
+
+class TestSharedCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_values_are_visible_to_other_instances(self):
+        """A second cache on the same file (as in another worker) sees stored values."""
+        key = SharedCache.make_key('ss', 'aspirin trials', 8)
+        SharedCache(self.path, 'search').set(key, [{'title': 'A', 'abstract': 'B'}])
+        self.assertEqual(SharedCache(self.path, 'search').get(key), [{'title': 'A', 'abstract': 'B'}])
+        self.assertIsNone(SharedCache(self.path, 'other').get(key))
+
+    def test_expired_entries_are_misses_and_pruned(self):
+        """Entries past their TTL are not returned and prune removes them."""
+        cache = SharedCache(self.path, 'search', ttl=0.01)
+        cache.set('k', 1)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('k'))
+        self.assertEqual(cache.prune(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+# Add the repo root (benchmarks) and backend directory (`src.*`, `api`) to the Python path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+import api
+from src import pdf_extraction
+from benchmarks.synthetic import make_paper, make_pdf
+
+PDF = make_pdf(make_paper(5, seed=1))
+
+
+def _multipart(data, boundary='uploadboundary'):
+    head = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="paper.pdf"\r\n'
+            'Content-Type: application/pdf\r\n\r\n').encode()
+    return head + data + f'\r\n--{boundary}--\r\n'.encode(), f'multipart/form-data; boundary={boundary}'
+
+
+class TestUploadLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(api.app)
+        patcher = mock.patch.object(api, 'analyze_plagiarism', return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_submission_id_from_form_or_header_is_the_index_id(self):
+        """Revisions sent with the same submission id share one lineage id in the index."""
+        files = {'file': ('paper.pdf', PDF, 'application/pdf')}
+        self.client.post('/analyze', files=files, data={'submission_id': '42'})
+        self.client.post('/analyze', files=files, headers={'X-Submission-Id': '42'})
+        self.client.post('/analyze', files=files)
+        self.assertEqual([c.args[1] for c in api.analyze_plagiarism.call_args_list], ['submission:42', 'submission:42', None])
+
+    def test_content_length_over_limit_is_rejected_before_reading(self):
+        with mock.patch.object(api, 'MAX_UPLOAD_BYTES', 1000):
+            response = self.client.post('/analyze', files={'file': ('paper.pdf', PDF, 'application/pdf')})
+        self.assertEqual(response.status_code, 413)
+
+    def test_upload_without_content_length_is_checked_after_spooling(self):
+        """A chunked upload bypasses the header check and is caught by its spooled size."""
+        body, content_type = _multipart(PDF)
+        chunks = (body[i:i + 4096] for i in range(0, len(body), 4096))
+        with mock.patch.object(api, 'MAX_UPLOAD_BYTES', len(PDF) - 1):
+            response = self.client.post('/analyze/full', content=chunks, headers={'Content-Type': content_type})
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('exceeds', response.json()['error'])
+
+    def test_page_cap_truncates_extraction(self):
+        with mock.patch.object(pdf_extraction, 'MAX_PDF_PAGES', 2):
+            response = self.client.post('/analyze', files={'file': ('paper.pdf', PDF, 'application/pdf')})
+        self.assertEqual(response.status_code, 200)
+        extraction = response.json()['extraction']
+        self.assertGreater(extraction['pages'], 2)
+        self.assertEqual((extraction['pages_read'], extraction['truncated']), (2, True))
+
+    def test_char_cap_truncates_extraction(self):
+        with mock.patch.object(pdf_extraction, 'MAX_TEXT_CHARS', 500):
+            response = self.client.post('/analyze', files={'file': ('paper.pdf', PDF, 'application/pdf')})
+        extraction = response.json()['extraction']
+        self.assertTrue(extraction['truncated'])
+        self.assertEqual(extraction['pages_read'], 1)
+
+if __name__ == '__main__':
+    unittest.main()